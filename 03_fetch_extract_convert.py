@@ -60,7 +60,7 @@ def _configure_converter_console_logging(level):
     return converter_logger
 
 
-def parse_args():
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(
         description="Download a documentation ZIP, extract, convert to Markdown, and build a single MD with online header links."
     )
@@ -110,7 +110,7 @@ def parse_args():
         action="store_true",
         help="Suppress verbose warning output on the console for cleaner runs.",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def derive_base_and_site(zip_url: str):
@@ -190,29 +190,35 @@ def format_time(seconds: float) -> str:
         return f"{hours}h {mins}m"
 
 
-def download_zip(zip_url: str, download_dir: Path, force: bool) -> Path:
+def download_zip(zip_url: str, download_dir: Path, force: bool, progress: bool = True) -> Path:
     ensure_dir(download_dir)
     filename = os.path.basename(urlparse(zip_url).path)
     dest = download_dir / filename
     if dest.exists() and not force:
-        print(f"✓ Using cached ZIP: {filename}")
+        if progress:
+            print(f"✓ Using cached ZIP: {filename}")
         return dest
 
-    print(f"↓ Downloading: {filename}")
+    if progress:
+        print(f"↓ Downloading: {filename}")
+    # Download to a side file so an interrupted transfer never looks like a cached ZIP
+    partial = dest.with_name(dest.name + ".part")
     with requests.get(zip_url, stream=True) as r:
         r.raise_for_status()
         total = int(r.headers.get("content-length", 0))
-        with open(dest, "wb") as f, tqdm(
+        with open(partial, "wb") as f, tqdm(
             total=total, 
             unit="B", 
             unit_scale=True, 
             desc="  Progress",
-            bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}]'
+            bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}]',
+            disable=not progress,
         ) as pbar:
             for chunk in r.iter_content(chunk_size=8192):
                 if chunk:
                     f.write(chunk)
                     pbar.update(len(chunk))
+    os.replace(partial, dest)
     return dest
 
 
@@ -321,9 +327,13 @@ def verify_and_fill_assets(md_dir: Path, site_dir: str, output_md_dir: Path, cop
             print(f"  ✓ Copied missing images to assets")
 
 
-def main():
+def main(argv=None):
+    """
+    Run download, extraction and conversion for one ZIP.
+    argv defaults to sys.argv[1:]; returns a process exit code.
+    """
     start_time = time.time()
-    args = parse_args()
+    args = parse_args(argv)
 
     converter_logger = _configure_converter_console_logging(
         None if args.quiet_warnings else logging.WARNING
@@ -353,7 +363,7 @@ def main():
     if not base_folders:
         print_section()
         print("✗ No base folders containing 'Content' found")
-        sys.exit(1)
+        return 1
 
     # Step 3: Convert
     print_section(format_bold("CONVERT"))
@@ -464,7 +474,8 @@ def main():
     total_time = time.time() - start_time
     print_section()
     print(format_green(f"✓ Done in {format_time(total_time)}"))
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
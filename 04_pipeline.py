@@ -6,11 +6,17 @@ Scans documentation site, provides TUI for selection, and processes multiple ite
 """
 
 import argparse
+import functools
+import hashlib
+import importlib.util
+import io
 import json
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from urllib.parse import urljoin, urlparse
@@ -41,6 +47,25 @@ _ensure_local_venv_python()
 
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Optional fast JSON codec for the catalog/items caches
+try:
+    import orjson
+
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+
+    def _json_dumps(payload) -> bytes:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_loads(data: bytes):
+        return json.loads(data)
+
+    def _json_dumps(payload) -> bytes:
+        return json.dumps(payload, indent=2).encode("utf-8")
 
 # For TUI
 try:
@@ -53,26 +78,36 @@ except ImportError:
 class DocItem:
     """Represents a documentation item with ZIP download link."""
     
+    __slots__ = ("name", "zip_url", "category", "selected", "display_name", "_search_blob")
+    
     def __init__(self, name: str, zip_url: str, category: str = ""):
         self.name = name
         self.zip_url = zip_url
         self.category = category
         self.selected = False
+        self.display_name = f"{category}: {name}" if category else name
+        # Case-folded once for TUI search; NUL keeps matches from spanning both fields.
+        self._search_blob = f"{name}\x00{category}".casefold()
     
     def __repr__(self):
         return f"DocItem({self.name}, {self.zip_url})"
 
 
 DEFAULT_DOC_ROOT = "https://www.microfocus.com/documentation/idol/"
+# libxml2-backed tree builder; much faster than the pure-Python html.parser
+HTML_PARSER = "lxml"
+_ZIP_HREF_RE = re.compile(r"\.zip", re.IGNORECASE)
 CACHE_DIR = Path.cwd() / ".cache"
 CATALOG_CACHE_FILE = CACHE_DIR / "idol_doc_catalog.json"
 ITEMS_CACHE_FILE = CACHE_DIR / "idol_doc_items.json"
+HTTP_CACHE_DIR = CACHE_DIR / "http"
 
 
 def _normalize_project_name(project: str) -> str:
     return re.sub(r"[^a-z0-9-]+", "-", project.strip().lower()).strip("-")
 
 
+@functools.lru_cache(maxsize=None)
 def _version_key(version: str) -> Tuple[int, ...]:
     parts = re.split(r"[._-]", version)
     numeric = []
@@ -88,14 +123,14 @@ def _load_json(path: Path) -> Dict:
     if not path.exists():
         return {}
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
+        return _json_loads(path.read_bytes())
+    except (ValueError, OSError):
         return {}
 
 
 def _save_json(path: Path, payload: Dict) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    path.write_bytes(_json_dumps(payload))
 
 
 def _cache_is_fresh(created_at: float, ttl_hours: float) -> bool:
@@ -122,15 +157,103 @@ def _parse_project_version(segment: str) -> Optional[Tuple[str, str]]:
     return project, version
 
 
-def fetch_page(url: str) -> str:
-    """Fetch HTML content from a URL."""
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+MAX_FETCH_RETRIES = 3
+# Index pages are ~100KB; anything this large is not a documentation index
+MAX_PAGE_BYTES = 20 * 1024 * 1024
+
+
+def _build_session() -> requests.Session:
+    """
+    Shared session so repeated fetches reuse pooled keep-alive connections.
+    Rate-limit/transient statuses are retried with exponential backoff,
+    honoring Retry-After.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=MAX_FETCH_RETRIES,
+        backoff_factor=0.25,
+        status_forcelist=RETRY_STATUS_CODES,
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SESSION = _build_session()
+
+
+def _http_cache_path(url: str) -> Path:
+    return HTTP_CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+
+def fetch_page_conditional(url: str) -> Tuple[str, Optional[str], bool]:
+    """
+    Fetch HTML content from a URL.
+    Bodies are cached with their ETag/Last-Modified validators so repeat fetches
+    are conditional requests answered by 304 Not Modified.
+    Returns (html, validator, not_modified); html is "" on failure.
+    """
+    cache_path = _http_cache_path(url)
+    cached = _load_json(cache_path)
+    headers = {}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        return response.text
+        with _SESSION.get(url, timeout=30, headers=headers, stream=True) as response:
+            if response.status_code == 304 and "body" in cached:
+                return cached["body"], cached.get("etag") or cached.get("last_modified"), True
+            response.raise_for_status()
+            # Stream the body so oversized responses are abandoned without buffering them
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=65536):
+                size += len(chunk)
+                if size > MAX_PAGE_BYTES:
+                    print(f"Error fetching {url}: page exceeds {MAX_PAGE_BYTES} bytes")
+                    return "", None, False
+                chunks.append(chunk)
+            text = b"".join(chunks).decode(response.encoding or "utf-8", errors="replace")
     except requests.RequestException as e:
         print(f"Error fetching {url}: {e}")
-        return ""
+        return "", None, False
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        _save_json(cache_path, {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": text,
+        })
+    return text, etag or last_modified, False
+
+
+def fetch_page(url: str) -> str:
+    """Fetch HTML content from a URL ("" on failure)."""
+    return fetch_page_conditional(url)[0]
+
+
+def fetch_pages(urls: List[str], max_workers: int = 8) -> Dict[str, Tuple[str, Optional[str], bool]]:
+    """
+    Fetch several pages concurrently over the shared session.
+    Returns a mapping of URL to fetch_page_conditional() results.
+    """
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        return dict(zip(urls, executor.map(fetch_page_conditional, urls)))
+
+
+# Anchors are read straight from lxml's HTML tree (the parser BeautifulSoup
+# used here), so comments, scripts and unclosed tags are handled by libxml2
+_ZIP_LINK_PARSER = etree.HTMLParser(encoding="utf-8")
+# Anchor text the way get_text(strip=True) sees it: no comments, no script/style
+_ANCHOR_TEXT_XPATH = etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]")
 
 
 def extract_zip_links(html: str, base_url: str) -> List[Tuple[str, str]]:
@@ -138,35 +261,48 @@ def extract_zip_links(html: str, base_url: str) -> List[Tuple[str, str]]:
     Extract all ZIP download links from HTML.
     Returns list of (name, absolute_url) tuples.
     """
-    soup = BeautifulSoup(html, 'html.parser')
+    root = etree.fromstring(html.encode("utf-8"), _ZIP_LINK_PARSER) if html else None
+    if root is None:
+        return []
     zip_links = []
     
     # Look for download links in the documentation tables
-    for link in soup.find_all('a', href=True):
-        href = link['href']
-        if href.endswith('.zip'):
-            abs_url = urljoin(base_url, href)
-            # Extract name from text or from URL
-            name = link.get_text(strip=True)
-            if not name or name.lower() in ['download zip file', 'download', 'zip']:
-                # Fallback: extract from filename
-                name = Path(urlparse(abs_url).path).stem
-            zip_links.append((name, abs_url))
+    for link in root.iter("a"):
+        href = link.get("href")
+        if not href or not href.endswith('.zip'):
+            continue
+        abs_url = urljoin(base_url, href)
+        # Extract name from text or from URL
+        name = "".join(text.strip() for text in _ANCHOR_TEXT_XPATH(link))
+        if not name or name.lower() in ['download zip file', 'download', 'zip']:
+            # Fallback: extract from filename
+            name = Path(urlparse(abs_url).path).stem
+        zip_links.append((name, abs_url))
     
     return zip_links
 
 
+_NON_PAGE_HREF_PREFIXES = ("#", "mailto:", "javascript:", "tel:")
+
+
 def _scan_catalog_from_root(root_url: str) -> List[Dict[str, str]]:
     html = fetch_page(root_url)
     if not html:
         return []
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     entries: List[Dict[str, str]] = []
     seen = set()
     root_parsed = urlparse(root_url)
     root_path = root_parsed.path.rstrip("/") + "/"
     for link in soup.find_all("a", href=True):
-        abs_url = urljoin(root_url, link["href"])
+        href = link["href"]
+        # Cheap string checks first: skip in-page/script/mail links and other
+        # hosts before paying for urljoin/urlparse.
+        if not href or href.startswith(_NON_PAGE_HREF_PREFIXES):
+            continue
+        if href.startswith(("http://", "https://", "//")) and root_parsed.netloc not in href:
+            continue
+        abs_url = urljoin(root_url, href)
         parsed = urlparse(abs_url)
         if parsed.netloc != root_parsed.netloc:
             continue
@@ -210,11 +346,20 @@ def load_catalog(root_url: str, refresh: bool, ttl_hours: float) -> List[Dict[st
     return entries
 
 
+_ITEMS_CACHE: Optional[Dict] = None
+
+
 def _load_items_cache() -> Dict:
-    return _load_json(ITEMS_CACHE_FILE)
+    # Read the cache file once per process; later saves mutate this dict in place.
+    global _ITEMS_CACHE
+    if _ITEMS_CACHE is None:
+        _ITEMS_CACHE = _load_json(ITEMS_CACHE_FILE)
+    return _ITEMS_CACHE
 
 
 def _save_items_cache(cache: Dict) -> None:
+    global _ITEMS_CACHE
+    _ITEMS_CACHE = cache
     _save_json(ITEMS_CACHE_FILE, cache)
 
 
@@ -225,50 +370,38 @@ def _items_from_cache(start_url: str, ttl_hours: float) -> Optional[List[DocItem
         return None
     if not _cache_is_fresh(entry.get("created_at", 0), ttl_hours):
         return None
+    return _items_from_entry(entry)
+
+
+def _items_from_entry(entry: Dict) -> List[DocItem]:
     return [DocItem(x["name"], x["zip_url"], x.get("category", "")) for x in entry.get("items", [])]
 
 
-def _save_items_for_page(start_url: str, items: List[DocItem]) -> None:
+def _save_items_for_page(start_url: str, items: List[DocItem], validator: Optional[str] = None) -> None:
     cache = _load_items_cache()
     pages = cache.setdefault("pages", {})
     pages[start_url] = {
         "created_at": time.time(),
+        "validator": validator,
         "items": [{"name": i.name, "zip_url": i.zip_url, "category": i.category} for i in items],
     }
     _save_items_cache(cache)
 
 
-def scan_documentation_site(start_url: str, refresh: bool = False, ttl_hours: float = 24.0) -> List[DocItem]:
-    """
-    Scan documentation site and extract all available documentation items.
-    
-    Returns a list of DocItem objects with their ZIP URLs.
-    """
-    start_url = start_url.rstrip("/") + "/"
-    if not refresh:
-        cached = _items_from_cache(start_url, ttl_hours)
-        if cached is not None:
-            print(f"✓ Loaded {len(cached)} documentation items from cache")
-            return cached
-
-    print(f"🔍 Scanning documentation site: {start_url}")
-    
-    html = fetch_page(start_url)
-    if not html:
-        print("✗ Failed to fetch page")
-        return []
-    
-    soup = BeautifulSoup(html, 'html.parser')
+def _parse_documentation_items(html: str, start_url: str) -> List[DocItem]:
+    """Extract unique DocItems from a documentation index page."""
+    soup = BeautifulSoup(html, HTML_PARSER)
     items = []
     
-    # Strategy 1: Find tables with documentation links
-    tables = soup.find_all('table')
-    for table in tables:
-        # Get table header/category if available
-        category = ""
-        prev_elem = table.find_previous(['h1', 'h2', 'h3', 'h4'])
-        if prev_elem:
-            category = prev_elem.get_text(strip=True)
+    # Strategy 1: Find tables with documentation links.
+    # Walk headings and tables together in document order so each table picks up
+    # the nearest preceding heading as its category without a backwards search.
+    category = ""
+    for elem in soup.find_all(['h1', 'h2', 'h3', 'h4', 'table']):
+        if elem.name != 'table':
+            category = elem.get_text(strip=True)
+            continue
+        table = elem
         
         # Extract rows
         rows = table.find_all('tr')
@@ -282,18 +415,13 @@ def scan_documentation_site(start_url: str, refresh: bool = False, ttl_hours: fl
             name = name_cell.get_text(strip=True)
             
             # Look for ZIP download link in this row
-            zip_link = None
-            for cell in cells:
-                for link in cell.find_all('a', href=True):
-                    href = link['href']
-                    if '.zip' in href.lower():
-                        zip_link = urljoin(start_url, href)
-                        break
-                if zip_link:
-                    break
+            zip_anchor = next(
+                (a for a in row.find_all('a', href=True) if _ZIP_HREF_RE.search(a['href'])),
+                None,
+            )
             
-            if zip_link and name:
-                items.append(DocItem(name, zip_link, category))
+            if zip_anchor is not None and name:
+                items.append(DocItem(name, urljoin(start_url, zip_anchor['href']), category))
     
     # Strategy 2: Direct ZIP links if no tables found
     if not items:
@@ -303,28 +431,97 @@ def scan_documentation_site(start_url: str, refresh: bool = False, ttl_hours: fl
     
     # Remove exact duplicates only (same name AND same ZIP URL)
     # Keep rows that share a ZIP but represent different guides (e.g., C, C++, Java)
-    seen: set = set()
-    unique_items: List[DocItem] = []
+    unique: Dict[Tuple[str, str], DocItem] = {}
     for item in items:
-        key = (item.name, item.zip_url)
-        if key not in seen:
-            seen.add(key)
-            unique_items.append(item)
-    
+        unique.setdefault((item.name, item.zip_url), item)
+    return list(unique.values())
+
+
+def _scan_items_from_html(
+    start_url: str, html: str, validator: Optional[str] = None, not_modified: bool = False
+) -> List[DocItem]:
+    # A 304 for the page these items were parsed from means they are still current
+    if not_modified and validator:
+        entry = _load_items_cache().get("pages", {}).get(start_url, {})
+        if entry.get("validator") == validator:
+            items = _items_from_entry(entry)
+            print(f"✓ Page unchanged; reusing {len(items)} cached documentation items")
+            _save_items_for_page(start_url, items, validator)
+            return items
+    unique_items = _parse_documentation_items(html, start_url)
     print(f"✓ Found {len(unique_items)} documentation items")
-    _save_items_for_page(start_url, unique_items)
+    _save_items_for_page(start_url, unique_items, validator)
     return unique_items
 
 
+def scan_documentation_site(start_url: str, refresh: bool = False, ttl_hours: float = 24.0) -> List[DocItem]:
+    """
+    Scan documentation site and extract all available documentation items.
+    
+    Returns a list of DocItem objects with their ZIP URLs.
+    """
+    start_url = start_url.rstrip("/") + "/"
+    if not refresh:
+        cached = _items_from_cache(start_url, ttl_hours)
+        if cached is not None:
+            print(f"✓ Loaded {len(cached)} documentation items from cache")
+            return cached
+
+    print(f"🔍 Scanning documentation site: {start_url}")
+    
+    html, validator, not_modified = fetch_page_conditional(start_url)
+    if not html:
+        print("✗ Failed to fetch page")
+        return []
+    
+    return _scan_items_from_html(start_url, html, validator, not_modified)
+
+
+def scan_documentation_sites(
+    start_urls: List[str], refresh: bool = False, ttl_hours: float = 24.0
+) -> List[List[DocItem]]:
+    """
+    Scan several documentation sites, fetching all uncached pages concurrently.
+
+    Returns one item list per input URL, in input order.
+    """
+    normalized = [url.rstrip("/") + "/" for url in start_urls]
+    results: Dict[str, List[DocItem]] = {}
+    to_fetch: List[str] = []
+    for url in dict.fromkeys(normalized):
+        cached = None if refresh else _items_from_cache(url, ttl_hours)
+        if cached is not None:
+            print(f"✓ Loaded {len(cached)} documentation items from cache: {url}")
+            results[url] = cached
+        else:
+            to_fetch.append(url)
+
+    if to_fetch:
+        print(f"🔍 Scanning {len(to_fetch)} documentation sites")
+        pages = fetch_pages(to_fetch)
+        for url in to_fetch:
+            html, validator, not_modified = pages[url]
+            if not html:
+                print(f"✗ Failed to fetch page: {url}")
+                results[url] = []
+            else:
+                results[url] = _scan_items_from_html(url, html, validator, not_modified)
+
+    return [results[url] for url in normalized]
+
+
 class DocSelectorTUI:
     """Terminal UI for selecting documentation items."""
     
     def __init__(self, items: List[DocItem]):
         self.all_items = items
         self.filtered_items = items[:]
+        # Maintained on every (de)selection so draw() does not rescan all items
+        self.selected_count = sum(1 for item in items if item.selected)
         self.current_idx = 0
         self.scroll_offset = 0
         self.filter_text = ""
+        self._last_filter_text = ""
         self.mode = "normal"  # "normal" or "search"
         self.message = "Press '/' to search, SPACE to toggle, 'a' to select all, 'n' to select none, ENTER to confirm, 'q' to quit"
     
@@ -333,17 +530,24 @@ class DocSelectorTUI:
         if not self.filter_text:
             self.filtered_items = self.all_items[:]
         else:
-            pattern = self.filter_text.lower()
+            pattern = self.filter_text.casefold()
+            # Typing extends the query, so matches can only shrink: rescan the
+            # previous result instead of the full list.
+            if self._last_filter_text and self.filter_text.startswith(self._last_filter_text):
+                candidates = self.filtered_items
+            else:
+                candidates = self.all_items
             self.filtered_items = [
-                item for item in self.all_items
-                if pattern in item.name.lower() or pattern in item.category.lower()
+                item for item in candidates
+                if pattern in item._search_blob
             ]
+        self._last_filter_text = self.filter_text
         self.current_idx = 0
         self.scroll_offset = 0
     
     def draw(self, stdscr):
         """Draw the TUI."""
-        stdscr.clear()
+        stdscr.erase()
         height, width = stdscr.getmaxyx()
         
         # Title
@@ -351,8 +555,7 @@ class DocSelectorTUI:
         stdscr.addstr(0, (width - len(title)) // 2, title, curses.A_BOLD)
         
         # Stats line
-        selected_count = sum(1 for item in self.all_items if item.selected)
-        stats = f"Selected: {selected_count}/{len(self.all_items)} | Showing: {len(self.filtered_items)}"
+        stats = f"Selected: {self.selected_count}/{len(self.all_items)} | Showing: {len(self.filtered_items)}"
         stdscr.addstr(1, 2, stats)
         
         # Filter/search line
@@ -375,37 +578,26 @@ class DocSelectorTUI:
             
             item = self.filtered_items[item_idx]
             line_y = list_start + i
-            
-            # Cursor indicator
-            if item_idx == self.current_idx:
-                stdscr.addstr(line_y, 0, ">", curses.A_BOLD)
-            
-            # Checkbox
-            checkbox = "[X]" if item.selected else "[ ]"
-            stdscr.addstr(line_y, 2, checkbox)
-            
-            # Item name with category
-            display_name = item.name
-            if item.category:
-                display_name = f"{item.category}: {display_name}"
+            is_current = item_idx == self.current_idx
             
             # Truncate if too long
+            display_name = item.display_name
             max_name_len = width - 10
             if len(display_name) > max_name_len:
                 display_name = display_name[:max_name_len-3] + "..."
             
-            # Highlight current item
-            if item_idx == self.current_idx:
-                stdscr.addstr(line_y, 6, display_name, curses.A_REVERSE)
-            else:
-                stdscr.addstr(line_y, 6, display_name)
+            # Cursor, checkbox and name in one write; highlight the current row
+            checkbox = "[X]" if item.selected else "[ ]"
+            row = f"{'>' if is_current else ' '} {checkbox} {display_name}"
+            stdscr.addstr(line_y, 0, row, curses.A_REVERSE if is_current else curses.A_NORMAL)
         
         # Help line
         help_y = height - 2
         stdscr.addstr(help_y, 0, "─" * width)
         stdscr.addstr(help_y + 1, 2, self.message[:width-4])
         
-        stdscr.refresh()
+        stdscr.noutrefresh()
+        curses.doupdate()
     
     def handle_input(self, key):
         """Handle keyboard input. Returns True to continue, False to exit."""
@@ -444,26 +636,33 @@ class DocSelectorTUI:
                 self.filter_text = ""
             elif key == ord(' '):
                 if self.filtered_items:
-                    self.filtered_items[self.current_idx].selected = not self.filtered_items[self.current_idx].selected
+                    item = self.filtered_items[self.current_idx]
+                    item.selected = not item.selected
+                    self.selected_count += 1 if item.selected else -1
             elif key == ord('a'):
                 for item in self.filtered_items:
-                    item.selected = True
+                    if not item.selected:
+                        item.selected = True
+                        self.selected_count += 1
                 self.message = f"Selected all {len(self.filtered_items)} filtered items"
             elif key == ord('n'):
                 for item in self.filtered_items:
-                    item.selected = False
+                    if item.selected:
+                        item.selected = False
+                        self.selected_count -= 1
                 self.message = f"Deselected all {len(self.filtered_items)} filtered items"
             elif key == ord('A'):  # Shift+A - select all globally
                 for item in self.all_items:
                     item.selected = True
+                self.selected_count = len(self.all_items)
                 self.message = f"Selected all {len(self.all_items)} items"
             elif key == ord('N'):  # Shift+N - deselect all globally
                 for item in self.all_items:
                     item.selected = False
+                self.selected_count = 0
                 self.message = f"Deselected all {len(self.all_items)} items"
             elif key == 10:  # ENTER
-                selected = [item for item in self.all_items if item.selected]
-                if selected:
+                if self.selected_count:
                     return False  # Exit and proceed
                 else:
                     self.message = "⚠ No items selected! Press 'a' to select all or 'q' to quit"
@@ -527,13 +726,21 @@ class CatalogSelectorTUI:
         self.selected_entry: Optional[Dict[str, str]] = None
         self.project_idx = 0
         self.version_idx = 0
+        self._grouped_entries: Optional[List[Dict[str, str]]] = None
         self._rebuild_indices(keep_project=initial_project, keep_version=initial_version)
         if initial_project and initial_project in self.grouped:
             self.mode = "version"
 
     def _rebuild_indices(self, keep_project: Optional[str] = None, keep_version: Optional[str] = None):
-        self.grouped = _group_catalog_entries(self.entries)
-        self.projects = sorted(self.grouped.keys())
+        # Grouping sorts every project's versions; only redo it when entries were replaced.
+        if self._grouped_entries is not self.entries:
+            self.grouped = _group_catalog_entries(self.entries)
+            self.projects = sorted(self.grouped.keys())
+            self.version_rows = {
+                project: [v["version"] for v in versions]
+                for project, versions in self.grouped.items()
+            }
+            self._grouped_entries = self.entries
         if not self.projects:
             self.project_idx = 0
             self.version_idx = 0
@@ -547,7 +754,7 @@ class CatalogSelectorTUI:
         if not versions:
             self.version_idx = 0
             return
-        version_values = [v["version"] for v in versions]
+        version_values = self.version_rows[self.projects[self.project_idx]]
         if keep_version in version_values:
             self.version_idx = version_values.index(keep_version)
         else:
@@ -565,7 +772,7 @@ class CatalogSelectorTUI:
         return self.grouped.get(project, [])
 
     def draw(self, stdscr):
-        stdscr.clear()
+        stdscr.erase()
         height, width = stdscr.getmaxyx()
 
         title = "IDOL Project/Version Selector"
@@ -583,7 +790,7 @@ class CatalogSelectorTUI:
             cursor = self.project_idx
         else:
             stdscr.addstr(3, 2, "Mode: Version selection (b/Backspace/Left = back)")
-            rows = [v["version"] for v in versions]
+            rows = self.version_rows.get(project, [])
             cursor = self.version_idx
 
         list_start = 5
@@ -605,7 +812,8 @@ class CatalogSelectorTUI:
         help_y = height - 2
         stdscr.addstr(help_y, 0, "─" * width)
         stdscr.addstr(help_y + 1, 2, self.message[: max(0, width - 4)])
-        stdscr.refresh()
+        stdscr.noutrefresh()
+        curses.doupdate()
 
     def handle_input(self, key):
         if key == ord("q"):
@@ -658,16 +866,43 @@ class CatalogSelectorTUI:
             if not self.handle_input(key):
                 break
 
-def run_conversion(zip_url: str, args: argparse.Namespace) -> bool:
-    """
-    Run the conversion script for a single ZIP URL.
-    Returns True on success, False on failure.
-    """
-    import subprocess
-    
-    cmd = [
-        sys.executable,
-        str(Path(__file__).parent / "03_fetch_extract_convert.py"),
+_OUTPUT_LOCK = threading.Lock()
+
+
+def _log(line: str) -> None:
+    """Print one line without interleaving with other conversion workers."""
+    with _OUTPUT_LOCK:
+        print(line, flush=True)
+
+
+_FETCH_CONVERT_MODULE = None
+# The prefetch thread and the main thread may both ask for the module first;
+# 03 installs a console handler on the root logger at import, so it must run once
+_FETCH_CONVERT_LOCK = threading.Lock()
+
+
+def _load_fetch_convert_module():
+    """Import 03_fetch_extract_convert.py once (its filename is not a valid module name)."""
+    global _FETCH_CONVERT_MODULE
+    if _FETCH_CONVERT_MODULE is None:
+        with _FETCH_CONVERT_LOCK:
+            if _FETCH_CONVERT_MODULE is None:
+                # The converter imports utils.* relative to the script directory
+                if str(SCRIPT_DIR) not in sys.path:
+                    sys.path.insert(0, str(SCRIPT_DIR))
+                module_path = SCRIPT_DIR / "03_fetch_extract_convert.py"
+                spec = importlib.util.spec_from_file_location("fetch_extract_convert03", str(module_path))
+                if spec is None or spec.loader is None:
+                    raise ImportError(f"Cannot load conversion module from {module_path}")
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                _FETCH_CONVERT_MODULE = module
+    return _FETCH_CONVERT_MODULE
+
+
+def _conversion_argv(zip_url: str, args: argparse.Namespace) -> List[str]:
+    """Command-line arguments for 03_fetch_extract_convert.py."""
+    argv = [
         zip_url,
         "--temp_download_dir", args.temp_download_dir,
         "--temp_extract_dir", args.temp_extract_dir,
@@ -676,23 +911,196 @@ def run_conversion(zip_url: str, args: argparse.Namespace) -> bool:
     ]
     
     if args.force:
-        cmd.append("--force")
+        argv.append("--force")
 
     if args.copy_all_images_to_assets:
-        cmd.append("--copy_all_images_to_assets")
+        argv.append("--copy_all_images_to_assets")
 
     if not getattr(args, "show_warnings", False):
-        cmd.append("--quiet-warnings")
-    
+        argv.append("--quiet-warnings")
+    return argv
+
+
+def _run_fetch_convert_main(argv: List[str]) -> bool:
     try:
-        result = subprocess.run(cmd, check=True)
-        return result.returncode == 0
-    except subprocess.CalledProcessError as e:
-        print(f"✗ Conversion failed with exit code {e.returncode}")
+        returncode = _load_fetch_convert_module().main(argv)
+    except SystemExit as e:
+        returncode = e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        _log(f"✗ Unexpected error: {e}")
+        return False
+    if returncode != 0:
+        _log(f"✗ Conversion failed with exit code {returncode}")
         return False
+    return True
+
+
+class _PrefixedStream(io.TextIOBase):
+    """Text stream that forwards complete lines to another stream with a "[label] " prefix."""
+
+    def __init__(self, label: str, target):
+        self._prefix = f"[{label}] "
+        self._target = target
+        self._pending = ""
+
+    def write(self, text: str) -> int:
+        lines = (self._pending + text).split("\n")
+        # Progress bars redraw with carriage returns; only the latest state matters
+        self._pending = lines.pop().rsplit("\r", 1)[-1]
+        for line in lines:
+            self._target.write(self._prefix + line.rsplit("\r", 1)[-1] + "\n")
+        if lines:
+            self._target.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        self._target.flush()
+
+    def finish(self) -> None:
+        """Write out a last line that never got its newline."""
+        if self._pending:
+            self._target.write(self._prefix + self._pending + "\n")
+            self._pending = ""
+        self._target.flush()
+
+
+def _convert_in_worker(argv: List[str], label: str) -> bool:
+    """
+    Process-pool entry point: run 03_fetch_extract_convert.main in this worker
+    process (module loaded once per worker) with output prefixed by label.
+    """
+    # Load 03 before swapping the streams: its console log handler grabs
+    # sys.stderr at import and is re-pointed at this ZIP's stream below
+    try:
+        module = _load_fetch_convert_module()
+    except Exception as e:
+        _log(f"[{label}] ✗ Unexpected error: {e}")
+        return False
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = _PrefixedStream(label, stdout)
+    sys.stderr = _PrefixedStream(label, stderr)
+    module.console_handler.setStream(sys.stderr)
+    try:
+        return _run_fetch_convert_main(argv)
+    finally:
+        sys.stdout.finish()
+        sys.stderr.finish()
+        sys.stdout, sys.stderr = stdout, stderr
+        module.console_handler.setStream(stderr)
+
+
+def run_conversion(zip_url: str, args: argparse.Namespace, label: Optional[str] = None) -> bool:
+    """
+    Run the conversion for a single ZIP URL.
+    Serial runs call 03_fetch_extract_convert in-process, skipping interpreter
+    startup; --isolate or a label (concurrent runs) uses a child process instead.
+    With a label, the child's output is forwarded line by line with a "[label]"
+    prefix so concurrent runs stay readable.
+    Returns True on success, False on failure.
+    """
+    import subprocess
+    
+    stream = label is not None
+    if not stream and not getattr(args, "isolate", False):
+        return _run_fetch_convert_main(_conversion_argv(zip_url, args))
+
+    cmd = [
+        sys.executable,
+        str(Path(__file__).parent / "03_fetch_extract_convert.py"),
+        *_conversion_argv(zip_url, args),
+    ]
+    
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE if stream else None,
+            stderr=subprocess.STDOUT if stream else None,
+            text=True,
+            errors="replace",
+            # Unbuffered child so captured output arrives as it is produced
+            env={**os.environ, "PYTHONUNBUFFERED": "1"} if stream else None,
+        )
+        if stream:
+            for line in proc.stdout:
+                _log(f"[{label}] {line.rstrip()}")
+        returncode = proc.wait()
     except Exception as e:
-        print(f"✗ Unexpected error: {e}")
+        _log(f"✗ Unexpected error: {e}")
         return False
+    if returncode != 0:
+        _log(f"✗ Conversion failed with exit code {returncode}")
+        return False
+    return True
+
+
+def _prefetch_zip(zip_url: str, args: argparse.Namespace) -> bool:
+    """Download a ZIP into the temp download dir quietly, for use while another ZIP converts."""
+    try:
+        download_dir = Path(args.temp_download_dir).expanduser().resolve()
+        _load_fetch_convert_module().download_zip(zip_url, download_dir, args.force, progress=False)
+        return True
+    except Exception:
+        # The conversion run retries the download itself and reports the error
+        return False
+
+
+def run_conversions(zip_urls: List[str], labels: Dict[str, str], args: argparse.Namespace) -> Dict[str, bool]:
+    """
+    Run conversions for several ZIP URLs, up to --pipeline_workers at a time.
+    Each URL must appear once so concurrent children never share a download.
+    Returns a mapping of ZIP URL to success flag.
+    """
+    workers = max(1, min(getattr(args, "pipeline_workers", 1), len(zip_urls)))
+    if workers == 1:
+        results: Dict[str, bool] = {}
+        # In-process runs download the next ZIP in the background while the
+        # current one extracts and converts (at most one ZIP ahead on disk).
+        prefetch = not getattr(args, "isolate", False)
+        downloaded_args = argparse.Namespace(**{**vars(args), "force": False})
+        with ThreadPoolExecutor(max_workers=1) as downloader:
+            next_download = None
+            for i, zip_url in enumerate(zip_urls, 1):
+                run_args = args
+                if next_download is not None and next_download.result():
+                    run_args = downloaded_args
+                next_download = None
+                if prefetch and i < len(zip_urls):
+                    next_download = downloader.submit(_prefetch_zip, zip_urls[i], args)
+                print(f"\n[{i}/{len(zip_urls)}] {labels.get(zip_url, zip_url)}")
+                print("-" * 70)
+                results[zip_url] = run_conversion(zip_url, run_args)
+        return results
+
+    # Conversion is CPU-bound (HTML parsing/markdownify), so workers are separate
+    # processes. By default each worker process imports the converter once and
+    # handles many ZIPs; --isolate starts a fresh child per ZIP instead.
+    isolate = getattr(args, "isolate", False)
+    print(f"Running {len(zip_urls)} conversions with {workers} parallel workers")
+    results = {}
+    executor_cls = ThreadPoolExecutor if isolate else ProcessPoolExecutor
+    with executor_cls(max_workers=workers) as executor:
+        if isolate:
+            futures = {
+                executor.submit(run_conversion, zip_url, args, labels.get(zip_url, zip_url)): zip_url
+                for zip_url in zip_urls
+            }
+        else:
+            futures = {
+                executor.submit(
+                    _convert_in_worker, _conversion_argv(zip_url, args), labels.get(zip_url, zip_url)
+                ): zip_url
+                for zip_url in zip_urls
+            }
+        for done, future in enumerate(as_completed(futures), 1):
+            zip_url = futures[future]
+            try:
+                results[zip_url] = future.result()
+            except Exception as e:
+                _log(f"✗ Unexpected error: {e}")
+                results[zip_url] = False
+            status = "✓" if results[zip_url] else "✗"
+            _log(f"[{done}/{len(zip_urls)}] {status} {labels.get(zip_url, zip_url)}")
+    return results
 
 
 def _group_catalog_entries(entries: List[Dict[str, str]]) -> Dict[str, List[Dict[str, str]]]:
@@ -700,6 +1108,7 @@ def _group_catalog_entries(entries: List[Dict[str, str]]) -> Dict[str, List[Dict
     for entry in entries:
         grouped.setdefault(entry["project"], []).append(entry)
     for project_entries in grouped.values():
+        # Versions repeat across projects; _version_key is memoized so each is parsed once.
         project_entries.sort(key=lambda x: _version_key(x["version"]), reverse=True)
     return grouped
 
@@ -909,6 +1318,17 @@ def main():
         default=10,
         help="Maximum worker threads for conversion (default: 10)",
     )
+    parser.add_argument(
+        "--pipeline_workers",
+        type=int,
+        default=1,
+        help="Number of ZIPs to convert concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run each conversion in a separate Python process instead of in-process",
+    )
     parser.add_argument(
         "--copy_all_images_to_assets",
         action="store_true",
@@ -985,27 +1405,25 @@ def main():
     
     success_count = 0
     failed_items = []
-    processed_zip_urls: set = set()
     
-    for i, item in enumerate(selected_items, 1):
-        print(f"\n[{i}/{len(selected_items)}] {item.name}")
-        print("-" * 70)
-        
-        # Avoid reprocessing the same ZIP multiple times if multiple guides share it
-        if item.zip_url in processed_zip_urls:
-            print(f"↺ Skipping duplicate ZIP already processed: {item.zip_url}")
-            success = True
-        else:
-            success = run_conversion(item.zip_url, args)
-            if success:
-                processed_zip_urls.add(item.zip_url)
-        
-        if success:
-            success_count += 1
-            print(f"✓ Completed: {item.name}")
-        else:
-            failed_items.append(item.name)
-            print(f"✗ Failed: {item.name}")
+    # Several guides can share one ZIP (e.g. C, C++, Java): convert each ZIP once
+    groups: Dict[str, List[DocItem]] = {}
+    for item in selected_items:
+        groups.setdefault(item.zip_url, []).append(item)
+    labels = {zip_url: ", ".join(item.name for item in group) for zip_url, group in groups.items()}
+    if len(groups) < len(selected_items):
+        print(f"↺ {len(selected_items)} selected items share {len(groups)} unique ZIPs")
+    results = run_conversions(list(groups), labels, args)
+    
+    print()
+    for zip_url, group in groups.items():
+        ok = results.get(zip_url, False)
+        for item in group:
+            if ok:
+                success_count += 1
+            else:
+                failed_items.append(item.name)
+        print(f"{'✓ Completed' if ok else '✗ Failed'}: {labels[zip_url]}")
     
     # Final summary
     print("\n" + "=" * 70)
@@ -3,9 +3,14 @@
 Analyze link errors from markdown files to identify patterns and fix them.
 """
 
+import fnmatch
+import ipaddress
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import defaultdict
+from typing import NamedTuple
 from urllib.parse import urlparse
 import sys
 
@@ -19,21 +24,55 @@ CYAN = '\033[96m'
 BOLD = '\033[1m'
 RESET = '\033[0m'
 
+# Pattern to match markdown links [text](url)
+_LINK_RE = re.compile(r'\[([^\]]+)\]\((https?://[^)]+)\)')
+
+# External documentation sites and their categories
+_EXTERNAL_DOCS = {
+    domain: f'external_{domain}'
+    for domain in (
+        'docs.oracle.com',
+        'www.vertica.com',
+        'www.googleapis.com',
+        'docs.microsoft.com',
+    )
+}
+# One pass over the host finds any known domain, however long the table grows
+_EXTERNAL_DOCS_RE = re.compile('|'.join(map(re.escape, _EXTERNAL_DOCS)))
+
 def extract_links_from_md(md_file: Path):
     """Extract all HTTP/HTTPS links from a markdown file."""
     try:
-        with open(md_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Pattern to match markdown links [text](url)
-        pattern = r'\[([^\]]+)\]\((https?://[^)]+)\)'
-        matches = re.findall(pattern, content)
-        
-        return [(text, url, md_file) for text, url in matches]
+        content = md_file.read_text(encoding='utf-8')
+        # Build the result rows straight from the matches, no intermediate list
+        return [(m.group(1), m.group(2), md_file) for m in _LINK_RE.finditer(content)]
     except Exception as e:
         print(f"{RED}Error reading {md_file}: {e}{RESET}")
         return []
 
+def find_md_files(directory: Path, pattern: str):
+    """
+    Return the files in directory matching pattern, sorted.
+
+    Single-level patterns (the default '*.md') are matched against os.scandir
+    entry names, so no Path object or stat call is made for non-matching
+    entries. Patterns that reach into subdirectories fall back to Path.glob.
+    """
+    if '/' in pattern or os.sep in pattern:
+        return sorted(p for p in directory.glob(pattern) if p.is_file())
+    with os.scandir(directory) as entries:
+        return sorted(
+            Path(entry.path) for entry in entries
+            if fnmatch.fnmatch(entry.name, pattern) and entry.is_file()
+        )
+
+def _is_ip_address(host: str):
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
 def categorize_url(url: str):
     """Categorize URLs by their pattern."""
     parsed = urlparse(url)
@@ -42,7 +81,7 @@ def categorize_url(url: str):
     if parsed.netloc == 'localhost' or parsed.netloc.startswith('localhost:'):
         return 'localhost'
     
-    if re.match(r'^\d+\.\d+\.\d+\.\d+', parsed.netloc):
+    if parsed.hostname and _is_ip_address(parsed.hostname):
         return 'ip_address'
     
     if parsed.netloc.endswith('.example.com') or 'example.com' in parsed.netloc:
@@ -68,20 +107,27 @@ def categorize_url(url: str):
         else:
             return 'microfocus_other'
     
-    # External documentation sites
-    external_docs = [
-        'docs.oracle.com',
-        'www.vertica.com',
-        'www.googleapis.com',
-        'docs.microsoft.com',
-    ]
-    
-    for domain in external_docs:
-        if domain in parsed.netloc:
-            return f'external_{domain}'
+    # External documentation sites (also matched with ports or subdomains)
+    match = _EXTERNAL_DOCS_RE.search(parsed.netloc)
+    if match:
+        return _EXTERNAL_DOCS[match.group(0)]
     
     return 'other'
 
+class MicroFocusLink(NamedTuple):
+    """One Micro Focus documentation link, grouped by analyze_microfocus_links."""
+    doc: str
+    path: str  # Part after /Guides/html/ or /html/, else the whole path after the doc name
+    url: str
+    file: str
+
+
+# Label printed before MicroFocusLink.path, per pattern
+_PATH_LABELS = {
+    'guides_html': 'After /Guides/html/:',
+    'html': 'After /html/:',
+}
+
 def analyze_microfocus_links(links):
     """Analyze Micro Focus documentation link patterns."""
     patterns = defaultdict(list)
@@ -99,42 +145,18 @@ def analyze_microfocus_links(links):
             # Identify the pattern
             if '/Guides/html/' in path_part:
                 # Extract what comes after Guides/html/
-                after_guides = path_part.split('/Guides/html/', 1)[1]
-                patterns['guides_html'].append({
-                    'doc': doc_name,
-                    'after_guides': after_guides,
-                    'url': url,
-                    'file': file_path.name
-                })
+                kind = 'guides_html'
+                path_part = path_part.split('/Guides/html/', 1)[1]
             elif '/html/' in path_part:
-                after_html = path_part.split('/html/', 1)[1]
-                patterns['html'].append({
-                    'doc': doc_name,
-                    'after_html': after_html,
-                    'url': url,
-                    'file': file_path.name
-                })
+                kind = 'html'
+                path_part = path_part.split('/html/', 1)[1]
             elif path_part.startswith('Help/'):
-                patterns['help'].append({
-                    'doc': doc_name,
-                    'path': path_part,
-                    'url': url,
-                    'file': file_path.name
-                })
+                kind = 'help'
             elif '/user/' in path_part or '/admin/' in path_part:
-                patterns['user_admin'].append({
-                    'doc': doc_name,
-                    'path': path_part,
-                    'url': url,
-                    'file': file_path.name
-                })
+                kind = 'user_admin'
             else:
-                patterns['other'].append({
-                    'doc': doc_name,
-                    'path': path_part,
-                    'url': url,
-                    'file': file_path.name
-                })
+                kind = 'other'
+            patterns[kind].append(MicroFocusLink(doc_name, path_part, url, file_path.name))
     
     return patterns
 
@@ -145,6 +167,8 @@ def main():
     parser.add_argument('directory', help='Directory containing markdown files')
     parser.add_argument('--pattern', default='*.md', help='File pattern to match (default: *.md)')
     parser.add_argument('--show-examples', type=int, default=3, help='Number of examples to show per category')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for link extraction (default: CPU count, 1 = no pool)')
     
     args = parser.parse_args()
     
@@ -154,7 +178,7 @@ def main():
         sys.exit(1)
     
     # Find all markdown files
-    md_files = sorted(directory.glob(args.pattern))
+    md_files = find_md_files(directory, args.pattern)
     
     if not md_files:
         print(f"{YELLOW}No markdown files found in {directory}{RESET}")
@@ -167,17 +191,22 @@ def main():
     
     # Collect all links
     all_links = []
-    for md_file in md_files:
-        links = extract_links_from_md(md_file)
-        all_links.extend(links)
+    if args.workers == 1:
+        for md_file in md_files:
+            all_links.extend(extract_links_from_md(md_file))
+    else:
+        # Reading and scanning each file is independent, so fan it out
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for links in pool.map(extract_links_from_md, md_files, chunksize=32):
+                all_links.extend(links)
     
     print(f"\n{BOLD}Total links found: {len(all_links)}{RESET}\n")
     
-    # Categorize links
+    # Categorize links, classifying each distinct URL only once
+    category_of = {url: categorize_url(url) for url in {url for _, url, _ in all_links}}
     categories = defaultdict(list)
     for text, url, file_path in all_links:
-        category = categorize_url(url)
-        categories[category].append((text, url, file_path))
+        categories[category_of[url]].append((text, url, file_path))
     
     # Print category statistics
     print(f"{BOLD}{BLUE}Link Categories:{RESET}\n")
@@ -209,15 +238,11 @@ def main():
         print(f"{CYAN}{pattern_name:20s}{RESET} {len(items):5d} links")
         
         if args.show_examples > 0 and items:
+            label = _PATH_LABELS.get(pattern_name, 'Path:')
             for item in items[:args.show_examples]:
-                print(f"  {YELLOW}Doc:{RESET} {item['doc']}")
-                if 'after_guides' in item:
-                    print(f"  {GREEN}After /Guides/html/:{RESET} {item['after_guides']}")
-                elif 'after_html' in item:
-                    print(f"  {GREEN}After /html/:{RESET} {item['after_html']}")
-                elif 'path' in item:
-                    print(f"  {GREEN}Path:{RESET} {item['path']}")
-                print(f"  {MAGENTA}File:{RESET} {item['file']}")
+                print(f"  {YELLOW}Doc:{RESET} {item.doc}")
+                print(f"  {GREEN}{label}{RESET} {item.path}")
+                print(f"  {MAGENTA}File:{RESET} {item.file}")
                 print()
     
     # Identify problematic patterns
@@ -22,6 +22,132 @@ import argparse
 import re
 import sys
 import os
+from pathlib import Path
+
+
+# Pattern 1: the _FT_SideNav_Startup footer marker
+_SIDENAV_FOOTER_RE = re.compile(
+    r'<!--\s*BEGIN_FILE:\s*[^>]*?[/\\]_FT_SideNav_Startup\.md\s*-->\s*\n'
+)
+
+# Pattern 2: the index.md or index_CSH.md footer marker
+_INDEX_FOOTER_RE = re.compile(
+    r'<!--\s*BEGIN_FILE:\s*[^>]*?[/\\]index(?:_CSH)?\.md\s*-->\s*\n'
+)
+
+# Trailing footer markers are only honoured in the last 5% of the document
+_FOOTER_TAIL_FRACTION = 0.95
+
+# Pattern 3: index_CSH sections with JavaScript (can appear anywhere)
+_JS_CSH_RE = re.compile(
+    r'<!--\s*BEGIN_FILE:.*?index_CSH\.md\s*-->\s*\n'
+    r'<a\s+id=["\'].*?["\'].*?>\s*</a>\s*\n'
+    r'.*?'
+    r'//\]\]>\s*\n',
+    re.MULTILINE | re.DOTALL
+)
+
+# Pattern 4: BEGIN_FILE debugging markers
+_BEGIN_FILE_RE = re.compile(r'<!--\s*BEGIN_FILE:.*?-->\s*\n', re.MULTILINE)
+
+# Pattern 5: anchor tags on their own line, whether or not a header follows
+# (a following header is left in place either way)
+_ANCHOR_RE = re.compile(
+    r'<a\s+id=["\'][^"\']+["\'](?:\s+[^>]*)?>(?:</a>)?\s*\n',
+    re.MULTILINE
+)
+
+# Pattern 6: footer artifacts that include search results and navigation
+_FOOTER_RE = re.compile(
+    r'\n---\s*\n'                                   # Starting horizontal rule
+    r'#\s+Your search for.*?returned result.*?\n'  # Search results header
+    r'.*?'                                          # Any content
+    r'\[Previous\]\(#\)\[Next\]\(#\)\s*\n'         # Navigation links
+    r'.*$',                                         # Everything to the end
+    re.MULTILINE | re.DOTALL
+)
+
+# Pattern 7: standalone search/navigation sections
+_SEARCH_NAV_RE = re.compile(
+    r'---\s*\n'
+    r'#\s+Your search for.*?returned result.*?\n'
+    r'.*?'
+    r'\[Previous\]\(#\)\[Next\]\(#\)',
+    re.MULTILINE | re.DOTALL
+)
+
+# Pattern 7b: "Your search for" headers at the end (without --- prefix)
+_SEARCH_HEADER_RE = re.compile(
+    r'\n#\s+Your search for.*?returned result.*?\s*$',
+    re.MULTILINE | re.DOTALL
+)
+
+# Pattern 8: orphaned navigation links
+_ORPHAN_NAV_RE = re.compile(r'\[Previous\]\(#\)\s*\[Next\]\(#\)', re.MULTILINE)
+
+# Pattern 9: more than 2 consecutive blank lines
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# Pattern 10: trailing horizontal rule
+_TRAILING_RULE_RE = re.compile(r'\n---\s*$')
+
+
+def _alternation(*named_patterns):
+    """
+    Combine compiled patterns into one alternation with a named group per pattern.
+
+    Each pattern keeps its own DOTALL/MULTILINE flags through a scoped inline
+    flag group, so the combined regex matches exactly what the parts would.
+    """
+    parts = []
+    for name, regex in named_patterns:
+        flags = ''
+        if regex.flags & re.DOTALL:
+            flags += 's'
+        if regex.flags & re.MULTILINE:
+            flags += 'm'
+        body = f'(?{flags}:{regex.pattern})' if flags else regex.pattern
+        parts.append(f'(?P<{name}>{body})')
+    return re.compile('|'.join(parts))
+
+
+# Markup removed anywhere in the document, tried in this order at each position
+_MARKUP_RE = _alternation(
+    ('js_csh', _JS_CSH_RE),
+    ('begin_file', _BEGIN_FILE_RE),
+    ('anchor', _ANCHOR_RE),
+)
+
+
+def _cut_trailing_section(content, marker_re):
+    """
+    Drop everything from the last marker_re match onwards, but only when that
+    match starts in the last 5% of the document (to be safe). Only the tail is
+    searched, so the bulk of the document is never scanned.
+    """
+    threshold = int(len(content) * _FOOTER_TAIL_FRACTION)
+    last_match = None
+    for last_match in marker_re.finditer(content, threshold):
+        pass
+    if last_match is None:
+        return content
+    return content[:last_match.start()]
+
+
+def _search_artifacts_start(content):
+    """
+    Offset where the first search-results match (patterns 6-7b) could begin, or -1.
+
+    Every such match consists only of whitespace, '#' and '-' before its
+    "Your search for" text, so no match can start before the run of those
+    characters that precedes the first occurrence.
+    """
+    start = content.find('Your search for')
+    if start == -1:
+        return -1
+    while start > 0 and (content[start - 1] in '#-' or content[start - 1].isspace()):
+        start -= 1
+    return start
 
 
 def clean_markdown_content(content):
@@ -36,104 +162,44 @@ def clean_markdown_content(content):
     
     # Pattern 1: Remove sections starting with blacklisted files that appear near the end
     # Look for _FT_SideNav_Startup specifically (the most common footer marker)
-    # Use a negative lookbehind to ensure we don't match within other paths
-    sidenav_footer = re.compile(
-        r'<!--\s*BEGIN_FILE:\s*[^>]*?[/\\]_FT_SideNav_Startup\.md\s*-->\s*\n'
-        r'.*$',  # Everything from here to end
-        re.MULTILINE | re.DOTALL
-    )
-    
-    # Find the last occurrence (in case there are multiple)
-    matches = list(sidenav_footer.finditer(content))
-    if matches:
-        last_match = matches[-1]
-        # Only remove if in the last 5% of the document (to be safe)
-        threshold = int(len(content) * 0.95)
-        if last_match.start() >= threshold:
-            content = content[:last_match.start()]
+    content = _cut_trailing_section(content, _SIDENAV_FOOTER_RE)
     
     # Pattern 2: Remove footer sections with index.md or index_CSH.md near the end
-    index_footer = re.compile(
-        r'<!--\s*BEGIN_FILE:\s*[^>]*?[/\\]index(?:_CSH)?\.md\s*-->\s*\n'
-        r'.*$',
-        re.MULTILINE | re.DOTALL
-    )
-    matches = list(index_footer.finditer(content))
-    if matches:
-        last_match = matches[-1]
-        threshold = int(len(content) * 0.95)
-        if last_match.start() >= threshold:
-            content = content[:last_match.start()]
-    
-    # Pattern 3: Remove index_CSH sections with JavaScript (can appear anywhere)
-    js_csh_pattern = re.compile(
-        r'<!--\s*BEGIN_FILE:.*?index_CSH\.md\s*-->\s*\n'
-        r'<a\s+id=["\'].*?["\'].*?>\s*</a>\s*\n'
-        r'.*?'
-        r'//\]\]>\s*\n',
-        re.MULTILINE | re.DOTALL
-    )
-    content = js_csh_pattern.sub('', content)
-    
-    # Pattern 4: Remove ALL BEGIN_FILE comments throughout the document
-    # These are debugging markers that editors don't recognize as markdown
-    begin_file_pattern = re.compile(r'<!--\s*BEGIN_FILE:.*?-->\s*\n', re.MULTILINE)
-    content = begin_file_pattern.sub('', content)
-    
-    # Pattern 5: Remove anchor tags that immediately precede headers
-    # This cleans up <a id="..."></a> tags that appear right before # headers
-    anchor_before_header = re.compile(
-        r'<a\s+id=["\']([^"\']+)["\'](?:\s+[^>]*)?>(?:</a>)?\s*\n'
-        r'(#+\s+)',
-        re.MULTILINE
-    )
-    content = anchor_before_header.sub(r'\2', content)
+    content = _cut_trailing_section(content, _INDEX_FOOTER_RE)
     
-    # Pattern 5b: Remove standalone anchor tags (not followed by headers)
-    # These can appear at the start of files or standalone in content
-    standalone_anchor = re.compile(
-        r'<a\s+id=["\']([^"\']+)["\'](?:\s+[^>]*)?>(?:</a>)?\s*\n',
-        re.MULTILINE
-    )
-    content = standalone_anchor.sub('', content)
-    
-    # Pattern 6: Remove footer artifacts that include search results and navigation
-    footer_pattern = re.compile(
-        r'\n---\s*\n'                                   # Starting horizontal rule
-        r'#\s+Your search for.*?returned result.*?\n'  # Search results header
-        r'.*?'                                          # Any content
-        r'\[Previous\]\(#\)\[Next\]\(#\)\s*\n'         # Navigation links
-        r'.*$',                                         # Everything to the end
-        re.MULTILINE | re.DOTALL
-    )
-    content = footer_pattern.sub('', content)
-    
-    # Pattern 7: Remove standalone search/navigation sections
-    search_nav_pattern = re.compile(
-        r'---\s*\n'
-        r'#\s+Your search for.*?returned result.*?\n'
-        r'.*?'
-        r'\[Previous\]\(#\)\[Next\]\(#\)',
-        re.MULTILINE | re.DOTALL
-    )
-    content = search_nav_pattern.sub('', content)
+    # Each pass below is skipped when the literal text its pattern requires is
+    # absent, which is the common case for most pages
     
-    # Pattern 7b: Remove "Your search for" headers at the end (without --- prefix)
-    search_header_pattern = re.compile(
-        r'\n#\s+Your search for.*?returned result.*?\s*$',
-        re.MULTILINE | re.DOTALL
-    )
-    content = search_header_pattern.sub('', content)
+    # Patterns 3-5: Remove index_CSH JavaScript blocks, BEGIN_FILE comments and
+    # anchor tags in a single scan (headers after anchors are kept)
+    if 'BEGIN_FILE:' in content or '<a' in content:
+        content = _MARKUP_RE.sub('', content)
+    
+    search_start = _search_artifacts_start(content)
+    if search_start != -1:
+        # Only the text from the first possible match onwards is rescanned
+        head, tail = content[:search_start], content[search_start:]
+        
+        # Pattern 6: Remove footer artifacts that include search results and navigation
+        tail = _FOOTER_RE.sub('', tail)
+        
+        # Pattern 7: Remove standalone search/navigation sections
+        tail = _SEARCH_NAV_RE.sub('', tail)
+        
+        # Pattern 7b: Remove "Your search for" headers at the end (without --- prefix)
+        tail = _SEARCH_HEADER_RE.sub('', tail)
+        content = head + tail
     
     # Pattern 8: Remove orphaned navigation links
-    orphan_nav_pattern = re.compile(r'\[Previous\]\(#\)\s*\[Next\]\(#\)', re.MULTILINE)
-    content = orphan_nav_pattern.sub('', content)
+    if '[Previous](#)' in content:
+        content = _ORPHAN_NAV_RE.sub('', content)
     
     # Pattern 9: Remove excessive blank lines (more than 2 consecutive)
-    content = re.sub(r'\n{3,}', '\n\n', content)
+    if '\n\n\n' in content:
+        content = _BLANK_LINES_RE.sub('\n\n', content)
     
     # Pattern 10: Clean up trailing horizontal rules and whitespace
-    content = re.sub(r'\n---\s*$', '', content)
+    content = _TRAILING_RULE_RE.sub('', content)
     
     # Trim leading and trailing whitespace
     content = content.strip()
@@ -141,6 +207,31 @@ def clean_markdown_content(content):
     return content
 
 
+def _read_text(path):
+    """Read a UTF-8 file in one decode call, normalising newlines like text mode does."""
+    text = Path(path).read_bytes().decode('utf-8', errors='ignore')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _write_text(path, text):
+    """Encode text once and write the bytes straight to the file descriptor."""
+    data = memoryview(text.encode('utf-8'))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if data and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(fd, 0, len(data))
+            except OSError:
+                pass  # Not supported by every filesystem; the write still works
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+    finally:
+        os.close(fd)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Clean unwanted elements from markdown files.',
@@ -189,8 +280,7 @@ Examples:
         if args.verbose:
             print(f"Reading: {args.input_file}")
         
-        with open(args.input_file, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        content = _read_text(args.input_file)
         
         original_size = len(content)
         
@@ -200,13 +290,15 @@ Examples:
         
         cleaned_content = clean_markdown_content(content)
         cleaned_size = len(cleaned_content)
+        # Release the raw text before writing so a large file is not held
+        # in memory twice alongside the encoded output
+        del content
         
         # Write output file
         if args.verbose:
             print(f"Writing: {output_file}")
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(cleaned_content)
+        _write_text(output_file, cleaned_content)
         
         # Report results
         reduction = original_size - cleaned_size
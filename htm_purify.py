@@ -1,15 +1,25 @@
 import argparse
 from bs4 import BeautifulSoup
 import os
-import html2text
-import bleach  # Add this import
+from markdownify import MarkdownConverter
 import re  # Add this import
+from utils.html_sanitize import sanitize_tree
+
+# Tags and attributes kept by sanitize_html
+ALLOWED_TAGS = {'p', 'br', 'strong', 'em', 'u', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+                'ol', 'ul', 'li', 'a', 'img', 'blockquote', 'code', 'pre', 'hr', 'div', 'span'}
+ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title'],
+    'img': ['src', 'alt', 'title'],
+    'div': ['class'],
+    'span': ['class']
+}
 
 def process_html_file(input_file, output_file=None):
     with open(input_file, 'r', encoding='utf-8', errors='ignore') as html_file:
         html_content = html_file.read()
     
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, 'lxml')
     main_content = extract_main_content(soup)
     
     print(f"Type of main_content: {type(main_content)}")
@@ -19,8 +29,10 @@ def process_html_file(input_file, output_file=None):
         print(f"Error: Could not extract main content from {input_file}")
         return
 
-    # Sanitize the HTML content using Bleach
-    sanitized_content = sanitize_html(str(main_content))
+    # Sanitize the parsed tree in place; the same tree is serialised and then
+    # converted to Markdown, so the file is only parsed once
+    sanitize_html(main_content)
+    sanitized_content = str(main_content)
 
     if output_file is None:
         base_name, ext = os.path.splitext(input_file)
@@ -31,9 +43,9 @@ def process_html_file(input_file, output_file=None):
     
     print(f"Extracted and sanitized main content saved to {output_file}")
     
-    # Convert to Markdown using html2text
+    # Convert to Markdown using markdownify
     md_output = os.path.splitext(output_file)[0] + '.md'
-    convert_to_markdown(sanitized_content, md_output)
+    convert_to_markdown(main_content, md_output)
     
     print(f"Converted HTML to Markdown: {md_output}")
     return output_file  # Return the output file name
@@ -44,41 +56,30 @@ def extract_main_content(soup):
         main_content = soup.find('div', {'class': 'main-content'})
     return main_content
 
-def sanitize_html(html_content):
-    # Define allowed tags and attributes
-    allowed_tags = ['p', 'br', 'strong', 'em', 'u', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
-                    'ol', 'ul', 'li', 'a', 'img', 'blockquote', 'code', 'pre', 'hr', 'div', 'span']
-    allowed_attributes = {
-        'a': ['href', 'title'],
-        'img': ['src', 'alt', 'title'],
-        'div': ['class'],
-        'span': ['class']
-    }
+def sanitize_html(element):
+    """Sanitize a parsed element in place (see utils.html_sanitize.sanitize_tree)."""
+    return sanitize_tree(element, ALLOWED_TAGS, ALLOWED_ATTRIBUTES)
+
+_LIST_ITEM_RE = re.compile(r'^(\s*)\*\s+`?(.+?)`?$', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
 
-    # Sanitize the HTML content
-    clean_html = bleach.clean(html_content, tags=allowed_tags, attributes=allowed_attributes, strip=True)
-    return clean_html
+def _fix_list_item(match):
+    indent = match.group(1)
+    content = match.group(2)
+    # Remove surrounding backticks if present (the pattern already drops one
+    # pair, this strips the second pair of a ``double`` code span)
+    if content.startswith('`') and content.endswith('`'):
+        content = content[1:-1]
+    return f"{indent}* {content}"
 
-def convert_to_markdown(html_content, md_file):
-    h = html2text.HTML2Text()
-    h.ignore_links = False
-    h.ignore_images = False
-    h.ignore_tables = False
-    markdown_content = h.handle(html_content)
+def convert_to_markdown(element, md_file):
+    markdown_content = MarkdownConverter(heading_style='ATX').convert_soup(element)
     
     # Fix list item formatting
-    def fix_list_item(match):
-        indent = match.group(1)
-        content = match.group(2)
-        # Remove surrounding backticks if present
-        if content.startswith('`') and content.endswith('`'):
-            content = content[1:-1]
-        return f"{indent}* {content}"
-    
-    markdown_content = re.sub(r'^(\s*)\*\s+`?(.+?)`?$', fix_list_item, markdown_content, flags=re.MULTILINE)
+    markdown_content = _LIST_ITEM_RE.sub(_fix_list_item, markdown_content)
     
     # Remove extra newlines
-    markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
+    markdown_content = _BLANK_LINES_RE.sub('\n\n', markdown_content)
     
     with open(md_file, 'w', encoding='utf-8') as f:
         f.write(markdown_content)
@@ -1,21 +1,26 @@
 import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
 from pathlib import Path
-from bs4 import BeautifulSoup
 import logging
 import re
 
-# Setup logging
-logging.basicConfig(
-    filename='rename_folders.log',
-    filemode='w',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+def setup_logging(filemode='w'):
+    # Worker processes started with 'spawn' call this with filemode='a' so they
+    # don't truncate the log the main process already opened
+    logging.basicConfig(
+        filename='rename_folders.log',
+        filemode=filemode,
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Rename folders based on parsed HTML data.")
     parser.add_argument('input', type=str, help='Input directory containing extracted folders.')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes reading the HTML of each folder (default: CPU count, 1 = no pool).')
     return parser.parse_args()
 
 def normalize_whitespace(text):
@@ -25,6 +30,104 @@ def normalize_whitespace(text):
     text = re.sub(r'\s+', ' ', text).strip()
     return text
 
+class _Done(Exception):
+    """Raised by _ProductVarsParser once every wanted span has been read."""
+
+
+# Elements BeautifulSoup closes as soon as they open
+_VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen',
+    'link', 'menuitem', 'meta', 'param', 'source', 'track', 'wbr',
+))
+
+
+class _ProductVarsParser(HTMLParser):
+    """
+    Streams an HTML file looking for the 'Topic Title' and 'Product Version'
+    spans, and stops as soon as the wanted ones are complete instead of
+    building a full document tree.
+
+    Text is collected the way BeautifulSoup's get_text(strip=True) would:
+    each text run between tags is stripped and the non-empty runs are joined.
+    Open tags are tracked like BeautifulSoup's html.parser builder does, so an
+    end tag of an enclosing element also ends a span left open inside it.
+    """
+
+    def __init__(self, want_version=True):
+        super().__init__()
+        self.want_version = want_version
+        self.title = None
+        self.version = None
+        self._stack = []   # names of the open elements
+        self._active = {}  # span name -> [stack position of the span, text runs]
+
+    def _span_name(self, attrs):
+        cls = dict(attrs).get('class') or ''
+        if self.title is None and 'title' not in self._active and cls == 'mc-variable System.Title variable':
+            return 'title'
+        if self.want_version and self.version is None and 'version' not in self._active and '_FT_Product_Version' in cls:
+            return 'version'
+        return None
+
+    def handle_starttag(self, tag, attrs):
+        for capture in self._active.values():
+            capture[1].append('')
+        if tag == 'span':
+            name = self._span_name(attrs)
+            if name:
+                self._active[name] = [len(self._stack), ['']]
+        if tag not in _VOID_ELEMENTS:
+            self._stack.append(tag)
+
+    def handle_endtag(self, tag):
+        for capture in self._active.values():
+            capture[1].append('')
+        # An end tag without a matching open element is ignored
+        for pos in range(len(self._stack) - 1, -1, -1):
+            if self._stack[pos] == tag:
+                break
+        else:
+            return
+        del self._stack[pos:]
+        for name, capture in list(self._active.items()):
+            if capture[0] >= pos:
+                del self._active[name]
+                setattr(self, name, ''.join(run.strip() for run in capture[1]))
+        if self.title is not None and (self.version is not None or not self.want_version):
+            raise _Done
+
+    def handle_data(self, data):
+        for capture in self._active.values():
+            capture[1][-1] += data
+
+    def handle_comment(self, data):
+        # Comments are not text, but they do split the text around them
+        for capture in self._active.values():
+            capture[1].append('')
+
+    handle_pi = handle_comment
+
+    def close(self):
+        super().close()
+        # A span left open at the end of the file keeps everything after it
+        for name, capture in self._active.items():
+            setattr(self, name, ''.join(run.strip() for run in capture[1]))
+        self._active.clear()
+
+
+def _find_product_spans(file_path, want_version=True):
+    """Return the (topic title, product version) span texts of an HTML file, None when absent."""
+    parser = _ProductVarsParser(want_version)
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for chunk in iter(lambda: f.read(65536), ''):
+                parser.feed(chunk)
+        parser.close()
+    except _Done:
+        pass
+    return parser.title, parser.version
+
+
 def parse_html_for_vars(content_path):
     """
     Parses HTML files to extract the product name and version.
@@ -42,28 +145,26 @@ def parse_html_for_vars(content_path):
     product_version = None
 
     # Priority 1: Search for the first '_FT_SideNav_Startup.htm' file
-    startup_files = list(content_dir.rglob('_FT_SideNav_Startup.htm'))
-    if startup_files:
-        startup_file = startup_files[0]
+    # Check the top of Content directly, then walk the tree only until the first match
+    startup_file = content_dir / '_FT_SideNav_Startup.htm'
+    if not startup_file.is_file():
+        startup_file = next(content_dir.rglob('_FT_SideNav_Startup.htm'), None)
+    if startup_file:
         try:
-            with open(startup_file, 'r', encoding='utf-8') as f:
-                soup = BeautifulSoup(f, 'html.parser')
+            topic_title, version = _find_product_spans(startup_file)
 
-                # Extract 'Topic Title'
-                topic_title_span = soup.find('span', class_='mc-variable System.Title variable')
-                if topic_title_span:
-                    topic_title = topic_title_span.get_text(strip=True)
-                    product_name = normalize_whitespace(topic_title)
-                    logging.info(f"Extracted Product Name from '_FT_SideNav_Startup.htm' Topic Title: '{product_name}' in '{startup_file}'")
+            # Extract 'Topic Title'
+            if topic_title is not None:
+                product_name = normalize_whitespace(topic_title)
+                logging.info(f"Extracted Product Name from '_FT_SideNav_Startup.htm' Topic Title: '{product_name}' in '{startup_file}'")
 
-                # Extract 'Product Version'
-                product_version_span = soup.find('span', class_=lambda x: x and '_FT_Product_Version' in x)
-                if product_version_span:
-                    product_version = product_version_span.get_text(strip=True)
-                    logging.info(f"Extracted Product Version from '_FT_SideNav_Startup.htm': '{product_version}' in '{startup_file}'")
+            # Extract 'Product Version'
+            if version is not None:
+                product_version = version
+                logging.info(f"Extracted Product Version from '_FT_SideNav_Startup.htm': '{product_version}' in '{startup_file}'")
 
-                if product_name and product_version:
-                    return product_name, product_version
+            if product_name and product_version:
+                return product_name, product_version
 
         except Exception as e:
             logging.error(f"Error parsing '{startup_file}': {e}")
@@ -77,27 +178,21 @@ def parse_html_for_vars(content_path):
             if file.lower().endswith(('.htm', '.html')):
                 file_path = Path(root) / file
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        soup = BeautifulSoup(f, 'html.parser')
-
-                        # Priority 2a: Extract from 'Topic Title'
-                        topic_title_span = soup.find('span', class_='mc-variable System.Title variable')
-                        if topic_title_span:
-                            topic_title = topic_title_span.get_text(strip=True).replace('&#160;', ' ')  # Convert &#160; to space
-                            if topic_title:
-                                product_name = topic_title.replace('&#160;', ' ')  # Ensure any remaining &#160; is replaced
-                                logging.info(f"Extracted Product Name from Topic Title: '{product_name}' in '{file_path}'")
-
-                        # Priority 2b: Extract from 'Product Version' if available
-                        if not product_version:
-                            product_version_span = soup.find('span', class_=lambda x: x and '_FT_Product_Version' in x)
-                            if product_version_span:
-                                product_version = product_version_span.get_text(strip=True)
-                                logging.info(f"Extracted Product Version from '{file_path}': '{product_version}'")
-
-                        # If both are found, return immediately
-                        if product_name and product_version:
-                            return product_name, product_version
+                    topic_title, version = _find_product_spans(file_path, want_version=not product_version)
+
+                    # Priority 2a: Extract from 'Topic Title'
+                    if topic_title:
+                        product_name = topic_title.replace('&#160;', ' ')  # Convert any literal &#160; to space
+                        logging.info(f"Extracted Product Name from Topic Title: '{product_name}' in '{file_path}'")
+
+                    # Priority 2b: Extract from 'Product Version' if available
+                    if not product_version and version is not None:
+                        product_version = version
+                        logging.info(f"Extracted Product Version from '{file_path}': '{product_version}'")
+
+                    # If both are found, return immediately
+                    if product_name and product_version:
+                        return product_name, product_version
 
                 except Exception as e:
                     logging.error(f"Error parsing '{file_path}': {e}")
@@ -110,13 +205,22 @@ def parse_html_for_vars(content_path):
     return product_name, product_version
 
 
-def rename_folder(folder_path):
+def folder_product_vars(folder_path):
+    """Return parse_html_for_vars() for the folder's Content directory, None if it has none."""
+    content_path = folder_path / 'Content'
+    if not content_path.exists():
+        return None
+    return parse_html_for_vars(content_path)
+
+
+def rename_folder(folder_path, product_vars=None):
+    """Rename folder_path after its product; product_vars may carry an already parsed result."""
     content_path = folder_path / 'Content'
     if not content_path.exists():
         logging.error(f"No 'Content' folder found in {folder_path}")
         return
 
-    product_name, product_version = parse_html_for_vars(content_path)
+    product_name, product_version = product_vars or parse_html_for_vars(content_path)
     if not product_name or not product_version:
         logging.error(f"Could not find product name or version in {folder_path}")
         return
@@ -138,15 +242,24 @@ def rename_folder(folder_path):
 
 def main():
     args = parse_arguments()
+    setup_logging()
     input_dir = Path(args.input)
 
     if not input_dir.exists() or not input_dir.is_dir():
         print(f"Error: {input_dir} does not exist or is not a directory.")
         return
 
-    for item in input_dir.iterdir():
-        if item.is_dir():
-            rename_folder(item)
+    folders = [item for item in input_dir.iterdir() if item.is_dir()]
+    if args.workers == 1:
+        for folder in folders:
+            rename_folder(folder)
+    else:
+        # Reading the HTML is the slow part and independent per folder, so it runs
+        # in worker processes; renames stay here, one at a time, so two folders
+        # that resolve to the same name are still caught by the exists() check
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=setup_logging, initargs=('a',)) as executor:
+            for folder, product_vars in zip(folders, executor.map(folder_product_vars, folders)):
+                rename_folder(folder, product_vars)
 
     print("Renaming completed. Check 'rename_folders.log' for details.")
 
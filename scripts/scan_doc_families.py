@@ -1,33 +1,104 @@
 #!/usr/bin/env python3
 import os
 import json
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Optional fast JSON encoder for the report
+try:
+    import orjson
 
-def detect_family(doc_root: Path):
-    guides = doc_root / 'Guides' / 'html'
-    if guides.exists():
-        subs = [p.name for p in guides.iterdir() if p.is_dir()]
+    def _json_dumps(payload) -> bytes:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_dumps(payload) -> bytes:
+        return json.dumps(payload, indent=2).encode('utf-8')
+
+# How many directory levels below a doc root the fallback scan looks at
+FALLBACK_SCAN_DEPTH = 3
+
+
+def _subdir_names(path):
+    """Names of the directories directly inside `path` (empty if it can't be read)."""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it if entry.is_dir()}
+    except OSError:
+        return set()
+
+
+def _find_dir_names(root: Path, names, max_depth=FALLBACK_SCAN_DEPTH):
+    """
+    Breadth-first search for directories called any of `names` up to `max_depth`
+    levels below `root`; returns the subset found, stopping once all are seen.
+    Uses os.scandir so directory checks come from the cached entry type.
+    """
+    hits = set()
+    queue = deque([(root, 1)])
+    while queue:
+        path, depth = queue.popleft()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if not entry.is_dir():
+                        continue
+                    if entry.name in names:
+                        hits.add(entry.name)
+                        if len(hits) == len(names):
+                            return hits
+                    # Like os.walk, don't descend into symlinked directories
+                    if depth < max_depth and not entry.is_symlink():
+                        queue.append((entry.path, depth + 1))
+        except OSError:
+            continue
+    return hits
+
+
+_TRIAD = {'Content', 'Data', 'Resources'}
+
+
+def _detect_primary(doc_root: Path):
+    """
+    Classify doc_root from its own listing and the Guides/Help signals; returns
+    None when only the fallback scan can decide.
+    """
+    # One directory read of the root answers which primary signals exist at all
+    top = _subdir_names(doc_root)
+    if 'Guides' in top:
+        guides = doc_root / 'Guides' / 'html'
+        # One directory read lists the subfolders; Content is only probed for known ones
         known = {'expert', 'gettingstarted', 'documentsecurity'}
-        present = known.intersection(set(subs))
-        ok = all((guides / s / 'Content').exists() for s in present)
-        if len(present) >= 2 and ok:
+        present = known & _subdir_names(guides)
+        if len(present) >= 2 and all((guides / s / 'Content').exists() for s in present):
             return 'idolserver-merged'
-    help_dir = doc_root / 'Help'
-    if help_dir.exists() and (help_dir / 'Content').exists():
+    if 'Help' in top and (doc_root / 'Help' / 'Content').exists():
+        return 'single-bundle'
+    # The triad sitting directly in the root needs no deeper scan either
+    if len(_TRIAD & top) >= 2:
         return 'single-bundle'
+    return None
+
+
+def _detect_fallback(doc_root: Path):
     # exceptional fallback: shallow scan
-    triad = {'Content', 'Data', 'Resources'}
-    hits = set()
-    for root, dirs, files in os.walk(doc_root):
-        for d in dirs:
-            if d in triad:
-                hits.add(d)
-        if len(hits) == 3:
-            break
+    hits = _find_dir_names(doc_root, _TRIAD)
     return 'exceptional' if len(hits) < 2 else 'single-bundle'
 
 
+def detect_family(doc_root: Path):
+    return _detect_primary(doc_root) or _detect_fallback(doc_root)
+
+
+def _classify(doc_root: Path):
+    """Return (family, whether the fallback scan was needed) for one root."""
+    family = _detect_primary(doc_root)
+    if family is not None:
+        return family, False
+    return _detect_fallback(doc_root), True
+
+
 def main():
     import argparse
     ap = argparse.ArgumentParser(description='Scan documentation roots and classify families')
@@ -35,16 +106,26 @@ def main():
     ap.add_argument('--out', default='doc_family_report.json', help='Output JSON report path')
     args = ap.parse_args()
 
+    roots = [p for p in map(Path, args.roots) if p.exists()]
     report = {}
-    for r in args.roots:
-        p = Path(r)
-        if not p.exists():
-            continue
-        report[str(p)] = detect_family(p)
+    fallback_scans = 0
+    # Scanning is directory syscalls, which release the GIL, so roots are
+    # scanned concurrently; map() keeps the report in argument order
+    with ThreadPoolExecutor(max_workers=min(32, len(roots) or 1)) as executor:
+        for p, (family, used_fallback) in zip(roots, executor.map(_classify, roots)):
+            report[str(p)] = family
+            fallback_scans += used_fallback
+    # How many roots needed the fallback scan; well-formed bundles never do.
+    # Reported on stderr so the JSON report stays a plain root -> family map
+    print(f"Fallback scans: {fallback_scans}/{len(roots)}", file=sys.stderr)
 
-    with open(args.out, 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2)
-    print(json.dumps(report, indent=2))
+    # Serialise once; the same bytes go to the report file and to stdout
+    payload = _json_dumps(report)
+    with open(args.out, 'wb', buffering=1 << 16) as f:
+        f.write(payload)
+    sys.stdout.flush()
+    sys.stdout.buffer.write(payload + b'\n')
+    sys.stdout.buffer.flush()
 
 
 if __name__ == '__main__':
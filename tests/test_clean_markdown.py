@@ -0,0 +1,69 @@
+import functools
+import importlib.util
+from pathlib import Path
+
+
+@functools.lru_cache(maxsize=None)
+def _load_clean_module():
+    module_path = Path(__file__).resolve().parent.parent / "clean_markdown.py"
+    spec = importlib.util.spec_from_file_location("clean_markdown", str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_clean_markdown_content_strips_markers_and_anchors():
+    mod = _load_clean_module()
+    src = (
+        "<!-- BEGIN_FILE: Content/A/page.md -->\n"
+        '<a id="intro"></a>\n'
+        "# Intro\n"
+        "Body\n"
+        '<a id="loose"></a>\n'
+        "\n\n\n\n"
+        "More [Previous](#)[Next](#)\n"
+    )
+    out = mod.clean_markdown_content(src)
+    assert out == "# Intro\nBody\nMore"
+
+
+def test_clean_markdown_content_drops_trailing_sidenav_footer():
+    mod = _load_clean_module()
+    body = "Body line\n" * 1000
+    src = body + "<!-- BEGIN_FILE: Content/_FT_SideNav_Startup.md -->\nNav junk\n"
+    out = mod.clean_markdown_content(src)
+    assert "Nav junk" not in out
+    assert out.endswith("Body line")
+
+
+def test_clean_markdown_content_keeps_early_sidenav_section():
+    mod = _load_clean_module()
+    body = "Body line\n" * 100
+    src = "<!-- BEGIN_FILE: Content/_FT_SideNav_Startup.md -->\nEarly\n" + body
+    out = mod.clean_markdown_content(src)
+    assert out.startswith("Early")
+    assert "BEGIN_FILE" not in out
+
+
+def test_clean_markdown_content_removes_search_footer():
+    mod = _load_clean_module()
+    src = (
+        "Body\n"
+        "---\n"
+        '# Your search for "x" returned result(s).\n'
+        "noise\n"
+        "[Previous](#)[Next](#)\n"
+        "tail\n"
+    )
+    assert mod.clean_markdown_content(src) == "Body"
+
+
+def test_clean_markdown_content_cuts_at_last_trailing_sidenav_marker():
+    mod = _load_clean_module()
+    marker = "<!-- BEGIN_FILE: Content/_FT_SideNav_Startup.md -->\n"
+    body = "Body line\n" * 1000
+    src = marker + "Early\n" + body + marker + "Nav junk\n"
+    out = mod.clean_markdown_content(src)
+    assert out.startswith("Early")
+    assert "Nav junk" not in out
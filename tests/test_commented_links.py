@@ -1,7 +1,9 @@
+import functools
 import importlib.util
 from pathlib import Path
 
 
+@functools.lru_cache(maxsize=None)
 def _load_converter_module():
     module_path = Path(__file__).resolve().parent.parent / "02_convert_to_md.py"
     spec = importlib.util.spec_from_file_location("converter02", str(module_path))
@@ -0,0 +1,70 @@
+import functools
+import importlib.util
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from utils.html_sanitize import is_allowed_url, sanitize_tree
+
+
+TAGS = {'div', 'p', 'a', 'img', 'pre', 'code', 'span'}
+ATTRIBUTES = {'a': ['href', 'title'], 'img': ['src', 'alt'], 'span': ['class']}
+
+
+@functools.lru_cache(maxsize=None)
+def _load_purify_module():
+    module_path = Path(__file__).resolve().parent.parent / "htm_purify.py"
+    spec = importlib.util.spec_from_file_location("htm_purify", str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def _clean(html):
+    return str(sanitize_tree(BeautifulSoup(html, 'html.parser').div, TAGS, ATTRIBUTES))
+
+
+def test_is_allowed_url_rejects_script_schemes_however_written():
+    assert is_allowed_url('https://example.com/a')
+    assert is_allowed_url('mailto:docs@example.com')
+    assert is_allowed_url('../Content/page.htm#anchor')
+    assert is_allowed_url('#top')
+    assert is_allowed_url('/rel:ative')
+    assert not is_allowed_url('javascript:alert(1)')
+    assert not is_allowed_url(' JavaScript:alert(1)')
+    assert not is_allowed_url('java\tscript:alert(1)')
+    assert not is_allowed_url('jav\x00ascript:alert(1)')
+    assert not is_allowed_url('data:text/html;base64,xx')
+
+
+def test_sanitize_tree_drops_javascript_href_and_event_attributes():
+    out = _clean(
+        '<div><a href="java&#9;script:alert(1)" title="t" onclick="x()">a</a>'
+        '<img src="i.png" alt="A" onerror="x()"><span class="c" style="s">b</span></div>'
+    )
+    assert out == '<div><a title="t">a</a><img alt="A" src="i.png"/><span class="c">b</span></div>'
+
+
+def test_sanitize_tree_drops_comments_and_keeps_script_style_text():
+    out = _clean('<div><!-- note --><script>if (a < b) go()</script><style>p{}</style>x</div>')
+    assert out == '<div>if (a &lt; b) go()p{}x</div>'
+
+
+def test_sanitize_tree_unwraps_disallowed_tags():
+    out = _clean('<div>a<font color="red"><b>bold</b></font><section>s</section></div>')
+    # A stripped block-level tag leaves a line break, inline ones leave nothing
+    assert out == '<div>abold\ns</div>'
+
+
+def test_sanitize_tree_drops_newline_after_pre():
+    assert _clean('<div><pre>\ncode\n</pre></div>') == '<div><pre>code\n</pre></div>'
+
+
+def test_htm_purify_sanitize_html_uses_its_allow_list():
+    mod = _load_purify_module()
+    soup = BeautifulSoup(
+        '<div><a href="javascript:x" id="i">a</a><table><tr><td>t</td></tr></table></div>',
+        'html.parser',
+    )
+    assert str(mod.sanitize_html(soup.div)) == '<div><a>a</a>\nt</div>'
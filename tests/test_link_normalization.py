@@ -1,4 +1,9 @@
-from utils.link_normalization import strip_rel_and_ext, normalize_target_path, build_online_url, detect_doc_family_from_site_dir
+from utils.link_normalization import (
+    strip_rel_and_ext,
+    normalize_target_path,
+    build_online_url,
+    detect_doc_family_from_site_dir,
+)
 
 
 def case(base_url, site_dir, raw_rel, expected_url, family=None, sub=None):
@@ -33,6 +38,13 @@ def test_idolserver_shared_admin():
     case(base, doc, '../../Shared_Admin/IDOLOperations/_ADM_SearchAndRetrieval.htm#Natural', expected, sub=sub)
 
 
+def test_shared_admin_replaces_every_idolserver_spelling():
+    base = 'https://www.microfocus.com/documentation/idol/knowledge-discovery-25.4'
+    doc = 'IDOLServer/idolserver'
+    expected = f"{base}/LicenseServer/LicenseServer/Help/Content/Shared_Admin/Licenses.htm"
+    case(base, doc, '../../Shared_Admin/Licenses.htm', expected, sub='gettingstarted')
+
+
 def test_idolserver_expert_page():
     base = 'https://www.microfocus.com/documentation/idol/knowledge-discovery-25.4'
     doc = 'IDOLServer_25.4_Documentation'
@@ -1,10 +1,14 @@
 import argparse
 import curses
+import functools
 import importlib.util
+import io
 from pathlib import Path
 
 
+@functools.lru_cache(maxsize=None)
 def _load_pipeline_module():
+    # Execute the script once per test session; tests only patch it via monkeypatch
     module_path = Path(__file__).resolve().parent.parent / "04_pipeline.py"
     spec = importlib.util.spec_from_file_location("pipeline04", str(module_path))
     module = importlib.util.module_from_spec(spec)
@@ -108,6 +112,21 @@ def test_catalog_selector_left_arrow_goes_back_to_project_mode():
     assert selector.mode == "project"
 
 
+def test_catalog_selector_regroups_only_when_entries_are_replaced():
+    mod = _load_pipeline_module()
+    entries = _catalog_entries()
+    selector = mod.CatalogSelectorTUI(entries, refresh_callback=lambda: _catalog_entries())
+    grouped = selector.grouped
+    selector._rebuild_indices()
+    assert selector.grouped is grouped
+
+    replacement = _catalog_entries()
+    replacement[0] = dict(replacement[0], project="eduction", project_label="eduction")
+    selector.entries = replacement
+    selector._rebuild_indices()
+    assert selector.projects == ["eduction", "knowledge-discovery"]
+
+
 def _doc_items(mod):
     return [
         mod.DocItem("Getting Started Guide", "https://example/one.zip", "Guide"),
@@ -148,3 +167,220 @@ def test_doc_selector_search_left_arrow_goes_back():
     selector.filter_text = "abc"
     selector.handle_input(curses.KEY_LEFT)
     assert selector.mode == "normal"
+
+
+def test_doc_selector_filter_narrows_and_widens():
+    mod = _load_pipeline_module()
+    selector = _make_doc_selector(mod)
+    selector.filter_text = "e"
+    selector.filter_items()
+    assert [i.name for i in selector.filtered_items] == ["Getting Started Guide", "Release Notes"]
+    selector.filter_text = "el"
+    selector.filter_items()
+    assert [i.name for i in selector.filtered_items] == ["Release Notes"]
+    selector.filter_text = "st"
+    selector.filter_items()
+    assert [i.name for i in selector.filtered_items] == ["Getting Started Guide"]
+
+
+def test_run_conversions_parallel_returns_result_per_url(monkeypatch):
+    mod = _load_pipeline_module()
+    monkeypatch.setattr(mod, "run_conversion", lambda url, args, label=None: url.endswith("one.zip"))
+    urls = ["https://example/one.zip", "https://example/two.zip"]
+    args = argparse.Namespace(pipeline_workers=2, isolate=True)
+    results = mod.run_conversions(urls, {}, args)
+    assert results == {"https://example/one.zip": True, "https://example/two.zip": False}
+
+
+def test_parse_documentation_items_uses_nearest_preceding_heading():
+    mod = _load_pipeline_module()
+    html = (
+        "<table><tr><td>Intro</td><td><a href='intro.zip'>ZIP</a></td></tr></table>"
+        "<h2>Guides</h2><div><table><tr><td>Admin</td><td><a href='admin.zip'>ZIP</a></td></tr></table></div>"
+        "<h3>Reference</h3><table><tr><td>API</td><td><a href='api.zip'>ZIP</a></td></tr></table>"
+    )
+    items = mod._parse_documentation_items(html, "https://example/docs/")
+    assert [(i.name, i.category) for i in items] == [
+        ("Intro", ""),
+        ("Admin", "Guides"),
+        ("API", "Reference"),
+    ]
+
+
+def test_run_conversion_calls_fetch_convert_main_in_process(monkeypatch):
+    mod = _load_pipeline_module()
+    calls = []
+
+    class _FakeModule:
+        @staticmethod
+        def main(argv):
+            calls.append(argv)
+            return 0
+
+    monkeypatch.setattr(mod, "_load_fetch_convert_module", lambda: _FakeModule)
+    args = argparse.Namespace(
+        temp_download_dir="dl",
+        temp_extract_dir="ex",
+        output_md_dir="md",
+        max_workers=2,
+        force=True,
+        copy_all_images_to_assets=False,
+        show_warnings=False,
+        isolate=False,
+    )
+    assert mod.run_conversion("https://example/one.zip", args) is True
+    assert calls[0][0] == "https://example/one.zip"
+    assert "--force" in calls[0] and "--quiet-warnings" in calls[0]
+
+
+def test_load_fetch_convert_module_runs_import_once_across_threads(monkeypatch):
+    import threading
+    import time
+    import types
+
+    mod = _load_pipeline_module()
+    executed = []
+
+    class _SlowLoader:
+        def exec_module(self, module):
+            time.sleep(0.05)
+            executed.append(module)
+
+    spec = types.SimpleNamespace(loader=_SlowLoader())
+    monkeypatch.setattr(mod, "_FETCH_CONVERT_MODULE", None)
+    monkeypatch.setattr(mod.importlib.util, "spec_from_file_location", lambda name, path: spec)
+    monkeypatch.setattr(mod.importlib.util, "module_from_spec", lambda s: types.ModuleType("fake03"))
+    loaded = []
+    threads = [threading.Thread(target=lambda: loaded.append(mod._load_fetch_convert_module())) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(executed) == 1
+    assert all(m is executed[0] for m in loaded)
+
+
+def test_run_conversions_serial_prefetches_next_zip(monkeypatch):
+    mod = _load_pipeline_module()
+    events = []
+    monkeypatch.setattr(mod, "_prefetch_zip", lambda url, args: events.append(("prefetch", url)) or True)
+    monkeypatch.setattr(
+        mod,
+        "run_conversion",
+        lambda url, args, label=None: events.append(("convert", url, args.force)) or True,
+    )
+    urls = ["https://example/one.zip", "https://example/two.zip"]
+    args = argparse.Namespace(pipeline_workers=1, isolate=False, force=True)
+    assert mod.run_conversions(urls, {}, args) == {url: True for url in urls}
+    assert ("prefetch", urls[1]) in events
+    assert ("prefetch", urls[0]) not in events
+    # The first ZIP honours --force; the prefetched one is already fresh on disk.
+    assert ("convert", urls[0], True) in events
+    assert ("convert", urls[1], False) in events
+
+
+def test_doc_selector_tracks_selected_count():
+    mod = _load_pipeline_module()
+    selector = _make_doc_selector(mod)
+    selector.handle_input(ord(" "))
+    assert selector.selected_count == 1
+    selector.handle_input(ord("a"))
+    assert selector.selected_count == 2
+    selector.handle_input(ord(" "))
+    assert selector.selected_count == 1
+    selector.handle_input(ord("N"))
+    assert selector.selected_count == 0
+    selector.handle_input(ord("A"))
+    assert selector.selected_count == sum(1 for item in selector.all_items if item.selected)
+
+
+def test_scan_reuses_cached_items_when_page_not_modified(monkeypatch, tmp_path):
+    mod = _load_pipeline_module()
+    monkeypatch.setattr(mod, "ITEMS_CACHE_FILE", tmp_path / "items.json")
+    monkeypatch.setattr(mod, "_ITEMS_CACHE", None)
+    html = "<table><tr><td>Admin</td><td><a href='admin.zip'>ZIP</a></td></tr></table>"
+    url = "https://example/docs/"
+    monkeypatch.setattr(mod, "fetch_page_conditional", lambda u: (html, '"v1"', False))
+    first = mod.scan_documentation_site(url, refresh=True)
+
+    def _fail_parse(*args):
+        raise AssertionError("page should not be re-parsed")
+
+    monkeypatch.setattr(mod, "fetch_page_conditional", lambda u: (html, '"v1"', True))
+    monkeypatch.setattr(mod, "_parse_documentation_items", _fail_parse)
+    second = mod.scan_documentation_site(url, refresh=True)
+    assert [(i.name, i.zip_url) for i in second] == [(i.name, i.zip_url) for i in first]
+
+
+def test_extract_zip_links_names_and_resolves_zip_anchors():
+    mod = _load_pipeline_module()
+    html = (
+        '<a href="guide.zip">Download</a>'
+        "<A HREF='admin.zip'><b>Admin</b> Guide &amp; Notes</A>"
+        '<a href="page.htm">Page</a>'
+    )
+    assert mod.extract_zip_links(html, "https://example/docs/") == [
+        ("guide", "https://example/docs/guide.zip"),
+        ("AdminGuide & Notes", "https://example/docs/admin.zip"),
+    ]
+
+
+def test_extract_zip_links_ignores_data_href_comments_and_scripts():
+    mod = _load_pipeline_module()
+    html = (
+        '<a data-href="x.zip" href="y.htm">Not a ZIP</a>'
+        '<!-- <a href="old.zip">Old</a> -->'
+        '<script>document.write(\'<a href="js.zip">JS</a>\')</script>'
+        '<a href="new.zip">New<!-- note --></a>'
+    )
+    assert mod.extract_zip_links(html, "https://example/docs/") == [
+        ("New", "https://example/docs/new.zip"),
+    ]
+
+
+def test_extract_zip_links_unclosed_anchor_keeps_next_anchor():
+    mod = _load_pipeline_module()
+    html = '<p><a href="one.zip">One</p><p><a href="two.zip">Two</a></p>'
+    assert mod.extract_zip_links(html, "https://example/docs/") == [
+        ("One", "https://example/docs/one.zip"),
+        ("Two", "https://example/docs/two.zip"),
+    ]
+    assert mod.extract_zip_links("", "https://example/docs/") == []
+
+
+def test_prefixed_stream_prefixes_complete_lines_only():
+    mod = _load_pipeline_module()
+    target = io.StringIO()
+    stream = mod._PrefixedStream("Guide", target)
+    stream.write("first\nsec")
+    stream.write("ond\r 10%\r100%\n")
+    assert target.getvalue() == "[Guide] first\n[Guide] 100%\n"
+
+
+def test_convert_in_worker_logs_each_zip_under_its_own_label(monkeypatch, capsys):
+    import logging
+
+    mod = _load_pipeline_module()
+    handler = logging.StreamHandler()
+    logger = logging.getLogger("pipeline04-test-worker")
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    class _FakeModule:
+        console_handler = handler
+
+        @staticmethod
+        def main(argv):
+            logger.warning("warn %s", argv[0])
+            print("no newline", end="")
+            return 0
+
+    monkeypatch.setattr(mod, "_load_fetch_convert_module", lambda: _FakeModule)
+    try:
+        assert mod._convert_in_worker(["one.zip"], "One") is True
+        assert mod._convert_in_worker(["two.zip"], "Two") is True
+    finally:
+        logger.removeHandler(handler)
+    captured = capsys.readouterr()
+    assert captured.err.splitlines() == ["[One] warn one.zip", "[Two] warn two.zip"]
+    assert captured.out.splitlines() == ["[One] no newline", "[Two] no newline"]
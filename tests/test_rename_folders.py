@@ -0,0 +1,56 @@
+import functools
+import importlib.util
+from pathlib import Path
+
+
+@functools.lru_cache(maxsize=None)
+def _load_rename_module():
+    module_path = Path(__file__).resolve().parent.parent / "rename_folders.py"
+    spec = importlib.util.spec_from_file_location("rename_folders", str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+TITLE = '<span class="mc-variable System.Title variable">'
+VERSION = '<span class="mc-variable _FT_Product_Version variable">'
+
+
+def _spans(tmp_path, html, want_version=True):
+    page = tmp_path / "page.htm"
+    page.write_text(html, encoding="utf-8")
+    return _load_rename_module()._find_product_spans(page, want_version)
+
+
+def test_find_product_spans_joins_nested_span_text(tmp_path):
+    html = (
+        f"<p>{TITLE}IDOL <span class='x'>Content</span> <b>Server</b></span> tail</p>"
+        f"{VERSION}25.4<span>.0</span></span>"
+    )
+    assert _spans(tmp_path, html) == ("IDOLContentServer", "25.4.0")
+
+
+def test_find_product_spans_decodes_entities(tmp_path):
+    html = f"{TITLE}Knowledge&#160;Discovery &amp; More</span>{VERSION} 25.4 </span>"
+    assert _spans(tmp_path, html) == ("Knowledge\xa0Discovery & More", "25.4")
+
+
+def test_find_product_spans_comment_splits_text(tmp_path):
+    html = f"{TITLE} Media <!-- note --> Server </span>"
+    assert _spans(tmp_path, html, want_version=False) == ("MediaServer", None)
+
+
+def test_find_product_spans_unclosed_span_ends_with_enclosing_element(tmp_path):
+    html = f"<div>{TITLE}Open <i>title</i><br></div><p>after</p>"
+    assert _spans(tmp_path, html) == ("Opentitle", None)
+
+
+def test_find_product_spans_unclosed_span_at_end_of_file_keeps_rest(tmp_path):
+    html = f"{TITLE}Open <p>after</p>"
+    assert _spans(tmp_path, html) == ("Openafter", None)
+
+
+def test_find_product_spans_version_only_file(tmp_path):
+    html = f"<html><body>{VERSION}12.0</span></body></html>"
+    assert _spans(tmp_path, html) == (None, "12.0")
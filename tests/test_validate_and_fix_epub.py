@@ -0,0 +1,133 @@
+import functools
+import importlib.util
+import io
+from pathlib import Path
+
+from lxml import etree
+
+
+@functools.lru_cache(maxsize=None)
+def _load_epub_module():
+    module_path = Path(__file__).resolve().parent.parent / "validate_and_fix_epub.py"
+    spec = importlib.util.spec_from_file_location("validate_and_fix_epub", str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_naive_convert_angles_keeps_known_tags_and_escapes_the_rest():
+    convert = _load_epub_module().naive_convert_angles
+    cases = {
+        'plain text': 'plain text',
+        'a > b': 'a &gt; b',
+        '1 < 2': '1 &lt; 2',
+        '<x>': '&lt;x&gt;',
+        # Unclosed known tag: the '<' stays, nothing to close
+        '<p': '<p',
+        '<p<b>>': '<p<b>&gt;',
+        '<p>>': '<p>&gt;',
+        # Declarations and processing instructions are markup
+        '<!-- c -->': '<!-- c -->',
+        '<?pi x?>': '<?pi x?>',
+        # Tag names match case-insensitively; end tags are not in the list
+        '<P>x</P>': '<P>x&lt;/P&gt;',
+        '<Div class="x">1 < 2</Div>': '<Div class="x">1 &lt; 2&lt;/Div&gt;',
+    }
+    for text, expected in cases.items():
+        assert convert(text) == expected, text
+
+
+def test_fix_angle_brackets_in_element_fixes_text_tail_comment_and_pi():
+    mod = _load_epub_module()
+    root = etree.fromstring(
+        '<div>a &lt; b<span>x</span>c &gt; d<!-- 1 < 2 --><?pi x > y?>'
+        '<p>&lt;p&gt;<![CDATA[q<r]]>s</p><i>plain</i></div>',
+        etree.XMLParser(strip_cdata=False),
+    )
+    span, comment, pi, p, i = root
+    assert mod.fix_angle_brackets_in_element(root) is True
+    assert root.text == 'a &lt; b'
+    assert span.text == 'x'
+    assert span.tail == 'c &gt; d'
+    assert comment.text == ' 1 &lt; 2 '
+    assert pi.text == 'x &gt; y'
+    # The CDATA section is merged into p.text, which is fixed as one value
+    assert p.text == '<p>q&lt;rs'
+    assert i.text == 'plain'
+
+
+def test_fix_angle_brackets_in_element_reports_unchanged_tree():
+    mod = _load_epub_module()
+    root = etree.fromstring('<div>a<b>c</b>d<!-- e --><?pi f?><p>&lt;p&gt;</p></div>')
+    assert mod.fix_angle_brackets_in_element(root) is False
+    assert etree.tostring(root) == b'<div>a<b>c</b>d<!-- e --><?pi f?><p>&lt;p&gt;</p></div>'
+
+
+def test_needs_processing_spots_anything_that_may_need_a_fix():
+    needs_processing = _load_epub_module().needs_processing
+    assert needs_processing(b'<p>a > b</p>')
+    assert needs_processing(b'<p>a < b</p>')
+    assert needs_processing(b'<p>x</p><!-- <b> --><p>y</p>')
+    assert needs_processing(b'<p>x</p><!-- > --><p>y</p>')
+    assert needs_processing(b'<p><![CDATA[a<b]]></p>')
+    assert needs_processing(b'<p>&lt;b&gt;</p>')
+    assert needs_processing(b'<img src="a.png"/>')
+    assert needs_processing('<p>x</p>'.encode('utf-16'))
+    assert needs_processing(b'<p>x\x00</p>')
+
+
+def test_needs_processing_skips_reference_free_markup():
+    needs_processing = _load_epub_module().needs_processing
+    assert not needs_processing(b'<?xml version="1.0"?><html><body><p class="c">plain</p></body></html>')
+
+
+def test_load_epub_documents_leaves_out_reference_free_files(tmp_path):
+    mod = _load_epub_module()
+    (tmp_path / "plain.xhtml").write_bytes(b'<html><body><p>plain</p></body></html>')
+    (tmp_path / "linked.xhtml").write_bytes(b'<html><body><img src="a.png"/></body></html>')
+    for keep_trees in (True, False):
+        _, documents, refs = mod.load_epub_documents(str(tmp_path), keep_trees=keep_trees)
+        assert [Path(path).name for path, _ in documents] == ["linked.xhtml"]
+        assert refs == {"a.png"}
+
+
+def test_stream_resource_values_matches_iter_resource_attributes():
+    mod = _load_epub_module()
+    documents = [
+        b'<?xml version="1.0" encoding="utf-8"?>'
+        b'<html xmlns="http://www.w3.org/1999/xhtml" xmlns:xlink="http://www.w3.org/1999/xlink">'
+        b'<head><link href="../styles/a.css"/></head><body><img src="img/a.png"/>'
+        b'<a href="HTTP://x.com/p.png">w</a><a href="https://y">y</a><a href="ch2.xhtml#s">n</a>'
+        b'<svg><image xlink:href="img/b.svg"/></svg><img src=""/><img src="img/a.png"/></body></html>',
+        # Malformed documents, read with recover=True by both
+        b'<html><body><p><img src="a.png"><a href="b.htm">unclosed</p><img src="c.gif"/></body>',
+        b'<html><body><p>AT&T <img src="d.png"/> &nbsp; <a href="e.htm">x</a></p></body></html>',
+        b'<html><body><img src="f.png"/><p>truncated <a href="g',
+        # Comment or processing instruction ahead of the root element
+        b'<!-- generated --><html><body><img src="h.png"/></body></html>',
+        b'<?xml-stylesheet href="s.css" type="text/css"?><html><body><a href="i.htm">i</a></body></html>',
+    ]
+    for raw in documents:
+        tree = etree.parse(io.BytesIO(raw), parser=mod.XML_PARSER)
+        parsed = [val for _, _, val in mod.iter_resource_attributes(tree.getroot())]
+        assert sorted(mod.stream_resource_values(io.BytesIO(raw))) == sorted(parsed)
+        assert parsed
+
+
+def test_rewrite_file_skips_document_without_root(tmp_path, capsys):
+    mod = _load_epub_module()
+    page = tmp_path / "comment.xhtml"
+    page.write_bytes(b'<!-- a < b -->')
+    mod.rewrite_file(str(page), str(tmp_path), set())
+    assert capsys.readouterr().out == ""
+    assert page.read_bytes() == b'<!-- a < b -->'
+
+
+def test_load_epub_documents_streams_file_with_leading_comment(tmp_path, capsys):
+    mod = _load_epub_module()
+    (tmp_path / "page.xhtml").write_bytes(b'<!-- generated --><html><body><img src="a.png"/></body></html>')
+    _, documents, refs = mod.load_epub_documents(str(tmp_path), keep_trees=False)
+    assert [Path(path).name for path, _ in documents] == ["page.xhtml"]
+    assert refs == {"a.png"}
+    assert capsys.readouterr().out == ""
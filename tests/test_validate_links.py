@@ -0,0 +1,24 @@
+import functools
+import importlib.util
+from pathlib import Path
+
+
+@functools.lru_cache(maxsize=None)
+def _load_validate_links_module():
+    module_path = Path(__file__).resolve().parent.parent / "validate_links.py"
+    spec = importlib.util.spec_from_file_location("validate_links", str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_extract_links_from_md_finds_urls_inside_link_text(tmp_path):
+    page = tmp_path / "page.md"
+    page.write_text(
+        "[see https://a/x](https://b/y) and https://c/z "
+        "[again](https://b/y) [http://t](http://u)\n",
+        encoding="utf-8",
+    )
+    links = _load_validate_links_module().extract_links_from_md(page)
+    assert links == ["https://a/x", "https://b/y", "https://c/z", "http://t", "http://u"]
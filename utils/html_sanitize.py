@@ -0,0 +1,76 @@
+import re
+
+from bs4.element import NavigableString, PreformattedString
+
+# URL attributes with a scheme outside this list are dropped (e.g. javascript:)
+ALLOWED_PROTOCOLS = frozenset({'http', 'https', 'mailto'})
+_URL_ATTRIBUTES = frozenset({'href', 'src'})
+# Characters a browser ignores inside a URL ("java\tscript:"), removed before
+# the scheme is checked, the same set bleach removes
+_URL_INVISIBLE_RE = re.compile(r'[`\x00-\x20\x7f-\xa0\s]+')
+_SCHEME_RE = re.compile(r'([a-z][a-z0-9+.\-]*):')
+# A stripped block-level tag leaves a line break behind, as in a browser (and bleach)
+_BLOCK_LEVEL_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'dd', 'details', 'dialog', 'div',
+    'dl', 'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2',
+    'h3', 'h4', 'h5', 'h6', 'header', 'hgroup', 'hr', 'li', 'main', 'nav', 'ol',
+    'p', 'pre', 'section', 'table', 'ul',
+})
+
+
+def is_allowed_url(value: str, protocols=ALLOWED_PROTOCOLS) -> bool:
+    """True if value is a relative URL, a fragment, or uses one of protocols."""
+    normalized = _URL_INVISIBLE_RE.sub('', value).lower()
+    if normalized.startswith('#'):
+        return True
+    scheme = _SCHEME_RE.match(normalized)
+    return scheme is None or scheme.group(1) in protocols
+
+
+def _filter_attributes(tag, attributes, protocols):
+    allowed = attributes.get(tag.name, ())
+    attrs = {}
+    for name, value in tag.attrs.items():
+        if name not in allowed:
+            continue
+        if name in _URL_ATTRIBUTES and not is_allowed_url(value, protocols):
+            continue
+        attrs[name] = value
+    tag.attrs = attrs
+
+
+def _drop_leading_newline(pre):
+    # An HTML parser ignores a newline right after <pre>, as bleach's re-parse does
+    first = pre.contents[0] if pre.contents else None
+    if isinstance(first, NavigableString) and not isinstance(first, PreformattedString) and first.startswith('\n'):
+        if len(first) == 1:
+            first.extract()
+        else:
+            first.replace_with(first[1:])
+
+
+def sanitize_tree(element, tags, attributes, protocols=ALLOWED_PROTOCOLS):
+    """
+    Sanitize a parsed BeautifulSoup element in place, like
+    bleach.clean(..., strip=True): disallowed tags are unwrapped (their text,
+    script and style text included, is kept as plain text); comments and other
+    declarations, disallowed attributes and URLs with a disallowed scheme are
+    dropped.
+    The tree is not serialised and re-parsed, so callers can keep using it.
+    """
+    if 'pre' in tags:
+        for pre in element.find_all('pre'):
+            _drop_leading_newline(pre)
+    # Comments, CDATA, processing instructions and doctypes
+    for node in element.find_all(string=lambda text: isinstance(text, PreformattedString)):
+        node.extract()
+    if element.name in tags:
+        _filter_attributes(element, attributes, protocols)
+    for tag in element.find_all(True):
+        if tag.name in tags:
+            _filter_attributes(tag, attributes, protocols)
+        else:
+            if tag.name in _BLOCK_LEVEL_TAGS:
+                tag.insert_before('\n')
+            tag.unwrap()
+    return element
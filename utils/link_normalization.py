@@ -1,3 +1,4 @@
+import functools
 import os
 import re
 from urllib.parse import quote
@@ -14,8 +15,16 @@ CANONICAL_SEGMENTS = {
     'guides': 'Guides',
     'html': 'html',
 }
+# Lowercase and already-canonical spellings, so most segments resolve without .lower()
+_CANONICAL_ANYCASE = {**CANONICAL_SEGMENTS, **{v: v for v in CANONICAL_SEGMENTS.values()}}
+_CANONICAL_KEYS_LOWER = tuple(CANONICAL_SEGMENTS)
 
 
+# Shared_Admin pages are published under the LicenseServer doc set
+_IDOLSERVER_RE = re.compile(r'IDOLServer', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=64)
 def detect_doc_family_from_site_dir(site_dir: str) -> str:
     """Return 'idolserver' if site_dir denotes IDOLServer doc, else 'standard'."""
     return 'idolserver' if 'IDOLServer' in (site_dir or '') else 'standard'
@@ -29,9 +38,8 @@ def strip_rel_and_ext(path: str) -> tuple[str, str, str]:
     Missing extensions default to '.htm'; '.md' inputs are normalized to '.htm'
     """
     # Split anchor first
-    parts = path.split('#')
-    p = parts[0]
-    anchor = f'#{parts[1]}' if len(parts) > 1 else ''
+    p, sep, fragment = path.partition('#')
+    anchor = sep + fragment
     p, ext = os.path.splitext(p)
     ext = (ext or '').lower()
     if not ext:
@@ -47,28 +55,38 @@ def strip_rel_and_ext(path: str) -> tuple[str, str, str]:
     
     # Remove leading relative path segments, but keep the rest of the path intact
     # This avoids issues where paths don't start with '../' but are still valid
-    if p.startswith('../'):
-        p = re.sub(r'^(\.\./)+', '', p)
+    start = 0
+    while p.startswith('../', start):
+        start += 3
+    if start:
+        p = p[start:]
     
     return p, anchor, ext
 
 
+@functools.lru_cache(maxsize=8192)
 def _apply_canonical_segment_case(path: str) -> str:
-    """Rewrite known path segments to the casing published online."""
+    """Rewrite known path segments to the casing published online (cached per path)."""
     if not path:
         return path
+    # Paths that mention no known segment at all are returned without splitting
+    lowered = path.lower()
+    if not any(key in lowered for key in _CANONICAL_KEYS_LOWER):
+        return path
     pieces = []
     for segment in path.split('/'):
-        lower = segment.lower()
-        pieces.append(CANONICAL_SEGMENTS.get(lower, segment))
+        canonical = _CANONICAL_ANYCASE.get(segment)
+        if canonical is None:
+            canonical = CANONICAL_SEGMENTS.get(segment.lower(), segment)
+        pieces.append(canonical)
     return '/'.join(pieces)
 
 def _encode_path(path: str) -> str:
     """Percent-encode each segment of a path while preserving separators."""
     if not path:
         return ''
-    parts = [quote(part, safe='%-._~') for part in path.split('/')]
-    return '/'.join(parts)
+    # '/' is safe, so one quote() call encodes every segment and keeps the separators
+    return quote(path, safe='/%-._~')
 
 def _encode_component(value: str) -> str:
     if not value:
@@ -76,40 +94,29 @@ def _encode_component(value: str) -> str:
     return quote(value, safe='%-._~')
 
 
+# Content/ subtrees that expert links keep instead of moving under IDOLExpert/
+_EXPERT_PASSTHROUGH_DIRS = frozenset({'IDOLExpert', 'Shared_Admin', 'OmniGroupServer', 'IAS'})
+
+
+@functools.lru_cache(maxsize=8192)
 def normalize_target_path(path: str, family: str, idol_subfolder: Optional[str] = None) -> str:
-    """Apply ordered normalization rules to a target path (no host/doc shell)."""
+    """Apply ordered normalization rules to a target path (no host/doc shell; cached)."""
     path = (path or '').replace('\\', '/')
     path = _apply_canonical_segment_case(path)
 
-    # Rule 1: Shared_Admin → ensure under Content/
-    if path.startswith('Shared_Admin/'):
-        path = f'Content/{path}'
-
-    # Rule 2: ENCODINGS reference page variations → ensure Content/Actions/ENCODINGS
-    if 'ENCODINGS/_IDOL_ENCODINGS' in path:
-        if path.startswith('ENCODINGS/'):
-            path = f'Content/Actions/{path}'
-        elif path.startswith('Actions/ENCODINGS/'):
-            path = f'Content/{path}'
-
-    # Rule 3: Plain Actions/ → ensure under Content/
-    if path.startswith('Actions/') and not path.startswith('Actions/ENCODINGS/'):
-        path = f'Content/{path}'
-
-    # Rule 4: Standard family fallback → ensure path starts with Content/
-    if family != 'idolserver' and not path.startswith('Content/'):
-        path = f'Content/{path}'
-
-    # Rule 5: IDOLServer safety — ensure Content/ exists for idolserver too
-    if family == 'idolserver' and not path.startswith('Content/'):
-        path = f'Content/{path}'
+    # Rules 1-5: every family → ensure path starts with Content/. Shared_Admin/
+    # and Actions/ (rules 1 and 3) just get that prefix; only the bare
+    # ENCODINGS reference page (rule 2) also needs Actions/ put back in front
+    first, sep, _ = path.partition('/')
+    if first == 'ENCODINGS' and sep and 'ENCODINGS/_IDOL_ENCODINGS' in path:
+        path = 'Content/Actions/' + path
+    elif first != 'Content' or not sep:
+        path = 'Content/' + path
 
     # Rule 6: IDOLServer expert — ensure Content/IDOLExpert/ prefix when missing
     if family == 'idolserver' and (idol_subfolder or '').lower() == 'expert':
-        if path.startswith('Content/') and not path.startswith('Content/IDOLExpert/') \
-           and not path.startswith('Content/Shared_Admin/') \
-           and not path.startswith('Content/OmniGroupServer/') \
-           and not path.startswith('Content/IAS/'):
+        end = path.find('/', 8)
+        if end == -1 or path[8:end] not in _EXPERT_PASSTHROUGH_DIRS:
             path = 'Content/IDOLExpert/' + path[len('Content/'):]
 
     # Rule 7: IDOLServer documentsecurity — remap legacy MappedSecurity tree
@@ -119,6 +126,7 @@ def normalize_target_path(path: str, family: str, idol_subfolder: Optional[str]
     return path
 
 
+@functools.lru_cache(maxsize=256)
 def _normalize_online_subfolder(site_dir: Optional[str], subfolder: Optional[str]) -> str:
     """Normalize a subfolder hint to the portion expected in the published URL."""
     if not subfolder:
@@ -136,36 +144,46 @@ def _normalize_online_subfolder(site_dir: Optional[str], subfolder: Optional[str
     return sub
 
 
+@functools.lru_cache(maxsize=64)
+def _site_url_prefixes(base_url: str, site_dir: Optional[str]) -> Tuple[str, str]:
+    """
+    Return the '<base>/<site>' prefix and the LicenseServer '<base>/<site>/Help/'
+    prefix used for Shared_Admin pages. Both only depend on the doc set, so they
+    are built once instead of on every link.
+    """
+    base = base_url.rstrip('/')
+    site_dir = site_dir or ''
+    site_prefix = '/'.join((base, _encode_path(site_dir.strip('/'))))
+    license_site = _IDOLSERVER_RE.sub('LicenseServer', site_dir)
+    license_prefix = ''.join((base, '/', _encode_path(license_site.strip('/')), '/Help/'))
+    return site_prefix, license_prefix
+
+
+@functools.lru_cache(maxsize=8192)
 def build_online_url(base_url: str,
                      site_dir: str,
                      path: str,
                      anchor: str = '',
                      family: Optional[str] = None,
                      subfolder: Optional[str] = None) -> str:
-    """Build final online URL for the given normalized path and doc family."""
+    """Build final online URL for the given normalized path and doc family (cached)."""
     fam = family or detect_doc_family_from_site_dir(site_dir)
     path = path.lstrip('/')
-    sub = _normalize_online_subfolder(site_dir, subfolder)
-
-    site_clean = (site_dir or '').strip('/')
-    path_clean = path.lstrip('/')
-    path_encoded = _encode_path(path_clean)
-    site_encoded = _encode_path(site_clean)
-    sub_encoded = _encode_path(sub) if sub else ''
+    path_encoded = _encode_path(path)
+    site_prefix, license_prefix = _site_url_prefixes(base_url, site_dir)
 
     if 'Content/Shared_Admin/' in path:
-        license_site = re.sub(r'IDOLServer', 'LicenseServer', site_dir, flags=re.IGNORECASE)
-        target_site = _encode_path((license_site or site_dir).strip('/'))
-        return f"{base_url.rstrip('/')}/{target_site}/Help/{path_encoded}{anchor}"
+        return ''.join((license_prefix, path_encoded, anchor))
 
+    sub = _normalize_online_subfolder(site_dir, subfolder)
     if fam == 'idolserver':
-        sub_idol = (sub or '').split('/')[-1] if sub else ''
+        sub_idol = sub.split('/')[-1] if sub else ''
         sub_idol_encoded = _encode_component(sub_idol)
         if sub_idol_encoded:
-            return f"{base_url.rstrip('/')}/{site_encoded}/Guides/html/{sub_idol_encoded}/{path_encoded}{anchor}"
+            return ''.join((site_prefix, '/Guides/html/', sub_idol_encoded, '/', path_encoded, anchor))
         # Fallback without subfolder (should be rare)
-        return f"{base_url.rstrip('/')}/{site_encoded}/Guides/html/{path_encoded}{anchor}"
+        return ''.join((site_prefix, '/Guides/html/', path_encoded, anchor))
     # standard
     if sub and sub.lower() != 'help':
-        return f"{base_url.rstrip('/')}/{site_encoded}/{sub_encoded}/{path_encoded}{anchor}"
-    return f"{base_url.rstrip('/')}/{site_encoded}/Help/{path_encoded}{anchor}"
+        return ''.join((site_prefix, '/', _encode_path(sub), '/', path_encoded, anchor))
+    return ''.join((site_prefix, '/Help/', path_encoded, anchor))
@@ -1,8 +1,12 @@
+import io
 import os
+import re
 import sys
 import zipfile
 import shutil
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from lxml import etree
 from lxml.etree import XMLParser, XMLSyntaxError
@@ -22,6 +26,15 @@ SKIP_FILES = {'container.xml', 'nav.xhtml', 'mimetype', 'toc.ncx', 'content.opf'
 # We'll treat these as "media" that we do want to fix/copy
 MEDIA_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.svg', '.css', '.js', '.ttf', '.otf'}
 
+# Already compressed formats are stored as-is when repacking; deflating them again gains nothing
+STORED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.woff', '.woff2', '.mp3', '.mp4', '.zip'}
+# Deflate level for the rest: the fixed EPUB is rebuilt often, so favour speed over size
+REPACK_COMPRESSLEVEL = 1
+
+# One parser for every OPF/XHTML file; lxml parsers can be reused between
+# parse() calls, and each pool worker process gets its own copy
+XML_PARSER = XMLParser(ns_clean=True, recover=True, encoding='utf-8')
+
 ################################################################################
 # Basic I/O
 ################################################################################
@@ -36,6 +49,32 @@ def extract_epub(epub_path, extract_to):
     with zipfile.ZipFile(epub_path, 'r') as zf:
         zf.extractall(extract_to)
 
+def iter_files(folder):
+    """
+    Yield an os.DirEntry for every file below folder, in os.walk order (a
+    directory's files, then its subdirectories in turn). Entry types come from
+    scandir, so no extra stat per entry; symlinked directories are not
+    followed and unreadable directories are skipped, as with os.walk.
+    """
+    stack = [folder]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                yield entry
+            elif not entry.is_symlink():
+                subdirs.append(entry.path)
+        stack.extend(reversed(subdirs))
+
 def repack_epub(epub_root, original_epub_path, out_epub=None):
     if not out_epub:
         base_dir = os.path.dirname(original_epub_path)
@@ -45,19 +84,19 @@ def repack_epub(epub_root, original_epub_path, out_epub=None):
     if os.path.exists(out_epub):
         os.remove(out_epub)
 
-    with zipfile.ZipFile(out_epub, 'w', zipfile.ZIP_DEFLATED) as zf:
+    with zipfile.ZipFile(out_epub, 'w', zipfile.ZIP_DEFLATED, compresslevel=REPACK_COMPRESSLEVEL) as zf:
         # Store mimetype with no compression
         mimetype_file = os.path.join(epub_root, 'mimetype')
         if os.path.isfile(mimetype_file):
             zf.write(mimetype_file, 'mimetype', compress_type=zipfile.ZIP_STORED)
 
-        for root, dirs, files in os.walk(epub_root):
-            for f in files:
-                full_path = os.path.join(root, f)
-                rel_path = os.path.relpath(full_path, epub_root)
-                if rel_path == 'mimetype':
-                    continue
-                zf.write(full_path, rel_path, compress_type=zipfile.ZIP_DEFLATED)
+        for entry in iter_files(epub_root):
+            rel_path = os.path.relpath(entry.path, epub_root)
+            if rel_path == 'mimetype':
+                continue
+            ext = os.path.splitext(entry.name)[1].lower()
+            compress_type = zipfile.ZIP_STORED if ext in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+            zf.write(entry.path, rel_path, compress_type=compress_type)
 
     print(f"[INFO] New EPUB created at: {out_epub}")
 
@@ -65,18 +104,10 @@ def repack_epub(epub_root, original_epub_path, out_epub=None):
 # Gather references from OPF + XHTML
 ################################################################################
 
-def find_opf_file(epub_root):
-    for root, dirs, files in os.walk(epub_root):
-        for f in files:
-            if f.lower().endswith('.opf'):
-                return os.path.join(root, f)
-    return None
-
 def parse_opf_for_manifest(opf_path):
     refs = set()
-    parser = XMLParser(ns_clean=True, recover=True, encoding='utf-8')
     try:
-        tree = etree.parse(opf_path, parser=parser)
+        tree = etree.parse(opf_path, parser=XML_PARSER)
         root = tree.getroot()
         nsmap = root.nsmap.copy()
         if None in nsmap:
@@ -97,46 +128,109 @@ def parse_opf_for_manifest(opf_path):
         print(f"[WARN] parse_opf_for_manifest error: {ex}")
     return refs
 
-def parse_xhtml_for_resources(xhtml_path):
+XLINK_NS = {'xlink': 'http://www.w3.org/1999/xlink'}
+RESOURCE_ATTRS = ('src', 'href', '{http://www.w3.org/1999/xlink}href')
+# Compiled once, evaluated for every XHTML file
+RESOURCE_XPATH = etree.XPath('//*[@src or @href or @xlink:href]', namespaces=XLINK_NS)
+
+def iter_resource_attributes(xroot):
+    """
+    Yield (element, attribute, value) for every local src/href/xlink:href
+    value in a parsed XHTML tree (http/https links are left out).
+    """
+    for el in RESOURCE_XPATH(xroot):
+        for attr in RESOURCE_ATTRS:
+            val = el.get(attr)
+            if val and not val.lower().startswith(('http:', 'https:')):
+                yield el, attr, val
+
+# Two '<' with no '>' between them, or two '>' with no '<' between them: some
+# text, comment, PI or CDATA section holds an angle bracket
+_UNBALANCED_ANGLES_RE = re.compile(rb'<[^>]*<|>[^<]*>')
+
+def needs_processing(raw):
+    """
+    Return False when the raw bytes of an XHTML file show it has nothing to
+    gather or rewrite: no src/href, no character or entity references, and
+    angle brackets that only ever open and close tags. Anything not plain
+    8-bit text (e.g. UTF-16) is always processed.
+    """
+    if b'\x00' in raw or b'src' in raw or b'href' in raw or b'&' in raw:
+        return True
+    return _UNBALANCED_ANGLES_RE.search(raw) is not None
+
+def stream_resource_values(source):
+    """
+    Yield the same values as iter_resource_attributes while parsing source
+    incrementally; each element is cleared once read, so no full tree is
+    ever held in memory.
+    """
+    for _, el in etree.iterparse(source, events=('end',), recover=True, encoding='utf-8'):
+        for attr in RESOURCE_ATTRS:
+            val = el.get(attr)
+            if val and not val.lower().startswith(('http:', 'https:')):
+                yield val
+        el.clear()
+        # The root has no parent; its siblings (leading comments/PIs) stay
+        parent = el.getparent()
+        if parent is not None:
+            while el.getprevious() is not None:
+                del parent[0]
+
+def load_epub_documents(epub_root, keep_trees=True):
+    """
+    Walk the unzipped EPUB once and return (opf_file, documents, refs):
+    - opf_file: the first .opf file found (or None)
+    - documents: (path, tree) for every .xhtml/.html/.htm file, each parsed
+      once so the gather and rewrite steps share the same trees; with
+      keep_trees=False the tree is None and the file is only streamed
+    - refs: the local src/href/xlink:href values of those files
+    Files that needs_processing() rules out are left out without being parsed.
+    """
+    opf_file = None
+    documents = []
     refs = set()
-    parser = XMLParser(ns_clean=True, recover=True, encoding='utf-8')
-    try:
-        tree = etree.parse(xhtml_path, parser=parser)
-        root = tree.getroot()
-        if root is None:
-            return refs
-        elems = root.xpath('//*[@src or @href or @xlink:href]',
-                           namespaces={'xlink':'http://www.w3.org/1999/xlink'})
-        for el in elems:
-            for attr in ['src','href','{http://www.w3.org/1999/xlink}href']:
-                val = el.get(attr)
-                if val and not val.lower().startswith(('http:', 'https:')):
-                    refs.add(val)
-    except Exception as ex:
-        print(f"[WARN] parse_xhtml_for_resources error: {ex}")
-    return refs
+    for entry in iter_files(epub_root):
+        name = entry.name.lower()
+        if opf_file is None and name.endswith('.opf'):
+            opf_file = entry.path
+        if not name.endswith(('.xhtml', '.html', '.htm')):
+            continue
+        xhtml_path = entry.path
+        try:
+            with open(xhtml_path, 'rb') as fh:
+                raw = fh.read()
+            if not needs_processing(raw):
+                continue
+            if not keep_trees:
+                refs.update(stream_resource_values(io.BytesIO(raw)))
+                documents.append((xhtml_path, None))
+                continue
+            tree = etree.parse(io.BytesIO(raw), parser=XML_PARSER, base_url=xhtml_path)
+            if tree.getroot() is None:
+                continue
+            refs.update(val for _, _, val in iter_resource_attributes(tree.getroot()))
+        except Exception as ex:
+            print(f"[WARN] Could not parse {xhtml_path}: {ex}")
+            continue
+        documents.append((xhtml_path, tree))
+    return opf_file, documents, refs
 
-def gather_all_references(epub_root):
-    all_refs = set()
-    opf_file = find_opf_file(epub_root)
+def gather_all_references(opf_file, xhtml_refs):
+    all_refs = set(xhtml_refs)
     if opf_file:
         all_refs |= parse_opf_for_manifest(opf_file)
-
-    for root, dirs, files in os.walk(epub_root):
-        for f in files:
-            if f.lower().endswith(('.xhtml','.html','.htm')):
-                xhtml_path = os.path.join(root, f)
-                all_refs |= parse_xhtml_for_resources(xhtml_path)
-
     return all_refs
 
 ################################################################################
 # Deciding skip or media
 ################################################################################
 
+@lru_cache(maxsize=4096)
 def is_skip_file(path):
     """
-    Return True if path is .xhtml, .opf, etc.
+    Return True if path is .xhtml, .opf, etc. (cached, the same references
+    recur in every chapter)
     """
     fn = os.path.basename(path).lower()
     if fn in SKIP_FILES:
@@ -146,9 +240,10 @@ def is_skip_file(path):
         return True
     return False
 
+@lru_cache(maxsize=4096)
 def is_media_file(path):
     """
-    Return True if extension is in MEDIA_EXTENSIONS
+    Return True if extension is in MEDIA_EXTENSIONS (cached like is_skip_file)
     """
     ext = os.path.splitext(path)[1].lower()
     return (ext in MEDIA_EXTENSIONS)
@@ -157,49 +252,66 @@ def is_media_file(path):
 # Converting angle brackets
 ################################################################################
 
+# A '<' followed by one of these (case-insensitively) is kept as markup
+KNOWN_TAG_STARTS = (
+    '<p','<div','<span','<a','<img','<h1','<h2','<h3','<h4','<h5','<h6',
+    '<ul','<ol','<li','<table','<tr','<td','<th','<em','<strong','<b','<i',
+    '<br','<hr','<!','<?'
+)
+_KNOWN_TAG_START_LEN = max(map(len, KNOWN_TAG_STARTS))
+_ANGLE_RE = re.compile(r'[<>]')
+
 def naive_convert_angles(txt):
+    """
+    Escape stray angle brackets: a '<' opening a known tag is kept and its
+    matching '>' too; any other '<' or '>' becomes &lt; / &gt;. The regex jumps
+    between brackets, so plain text runs are copied in slices.
+    """
     result = []
-    i = 0
+    last = 0
     in_tag = False
-    known_starts = (
-        '<p','<div','<span','<a','<img','<h1','<h2','<h3','<h4','<h5','<h6',
-        '<ul','<ol','<li','<table','<tr','<td','<th','<em','<strong','<b','<i',
-        '<br','<hr','<!','<?'
-    )
-    while i < len(txt):
-        c = txt[i]
-        if c == '<':
-            snippet = txt[i:].lower()
-            if any(snippet.startswith(k) for k in known_starts):
+    for m in _ANGLE_RE.finditer(txt):
+        i = m.start()
+        result.append(txt[last:i])
+        if txt[i] == '<':
+            if txt[i:i + _KNOWN_TAG_START_LEN].lower().startswith(KNOWN_TAG_STARTS):
                 result.append('<')
                 in_tag = True
             else:
                 result.append('&lt;')
-            i += 1
-        elif c == '>':
-            if in_tag:
-                result.append('>')
-                in_tag = False
-            else:
-                result.append('&gt;')
-            i += 1
+        elif in_tag:
+            result.append('>')
+            in_tag = False
         else:
-            result.append(c)
-            i += 1
+            result.append('&gt;')
+        last = i + 1
+    result.append(txt[last:])
     return ''.join(result)
 
+# Text, comment and PI nodes below an element that contain '<' or '>';
+# libxml2 does the scan, so nodes without brackets never reach Python
+_ANGLE_NODES_XPATH = etree.XPath(
+    ".//text()[contains(., '<') or contains(., '>')]"
+    " | .//comment()[contains(., '<') or contains(., '>')]"
+    " | .//processing-instruction()[contains(., '<') or contains(., '>')]"
+)
+
 def fix_angle_brackets_in_element(root):
     changed = False
-    for el in root.iter():
-        if el.text and ('<' in el.text or '>' in el.text):
-            new_text = naive_convert_angles(el.text)
-            if new_text != el.text:
-                el.text = new_text
-                changed = True
-        if el.tail and ('<' in el.tail or '>' in el.tail):
-            new_tail = naive_convert_angles(el.tail)
-            if new_tail != el.tail:
-                el.tail = new_tail
+    # (element, 'text' or 'tail') slots to fix; a slot made of several text
+    # nodes (e.g. around CDATA) shows up more than once but is fixed once
+    slots = {}
+    for node in _ANGLE_NODES_XPATH(root):
+        if isinstance(node, str):
+            slots[(node.getparent(), 'tail' if node.is_tail else 'text')] = None
+        else:
+            slots[(node, 'text')] = None
+    for el, slot in slots:
+        value = getattr(el, slot)
+        if value and ('<' in value or '>' in value):
+            new_value = naive_convert_angles(value)
+            if new_value != value:
+                setattr(el, slot, new_value)
                 changed = True
     return changed
 
@@ -207,11 +319,42 @@ def fix_angle_brackets_in_element(root):
 # PART 6: Actually place missing media in "EPUB/media/"
 ################################################################################
 
-def find_file_recursively(folder, filename):
-    for r, dirs, files in os.walk(folder):
-        if filename in files:
-            return os.path.join(r, filename)
-    return None
+def build_name_index(folder):
+    """
+    Walk folder once and map each file name to its first path in os.walk
+    order, i.e. what a recursive search for that name would return.
+    """
+    index = {}
+    for entry in iter_files(folder):
+        index.setdefault(entry.name, entry.path)
+    return index
+
+def link_or_copy(src, dest):
+    """
+    Hard-link src to dest, copying only when linking fails (other filesystem,
+    no link support). Media files are never modified afterwards, so sharing
+    the inode is safe and skips reading and writing the data. The copy skips
+    the timestamps and permission bits too, the EPUB gets repacked anyway.
+    """
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
+@lru_cache(maxsize=4096)
+def media_file_name(resource_path):
+    """
+    File name a reference is stored under in EPUB/media: fragment, drive letter
+    and folders dropped (cached, it is needed for the same reference by the
+    missing-media check and by every file that rewrites it)
+    """
+    # strip #fragment
+    resource_path = resource_path.partition('#')[0].replace('\\','/')
+    # remove drive letter if any
+    if ':' in resource_path:
+        resource_path = resource_path.partition(':')[2]
+    resource_path = resource_path.lstrip('/')
+    return os.path.basename(resource_path)
 
 def unify_to_epub_media(absolute_epub_root, resource_path):
     """
@@ -220,18 +363,21 @@ def unify_to_epub_media(absolute_epub_root, resource_path):
     2) We'll physically place the file in [absolute_epub_root]/EPUB/media/<filename>.
     3) Return (dest_abs, final_filename) so the caller can do the copy if missing.
     """
-    # strip #fragment
-    resource_path = resource_path.split('#',1)[0].replace('\\','/')
-    # remove drive letter if any
-    if ':' in resource_path:
-        resource_path = resource_path.split(':',1)[-1]
-    resource_path = resource_path.lstrip('/')
-    filename = os.path.basename(resource_path)
+    filename = media_file_name(resource_path)
 
     # The physical path where we want to store the file
     dest_abs = os.path.join(absolute_epub_root, 'EPUB', MEDIA_DIR_NAME, filename)
     return (dest_abs, filename)
 
+def media_file_names(epub_root):
+    """Names of the files already in [epub_root]/EPUB/media, from one directory read."""
+    media_dir = os.path.join(epub_root, 'EPUB', MEDIA_DIR_NAME)
+    try:
+        with os.scandir(media_dir) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        return set()
+
 def fix_missing_media(epub_root, references, original_epub_dir):
     """
     Copy only "media" type files (images, css, etc.) into [epub_root]/EPUB/media/<filename>
@@ -240,25 +386,34 @@ def fix_missing_media(epub_root, references, original_epub_dir):
     print("[INFO] Checking for missing media...")
 
     search_folder = None
+    # Name -> path indexes, each built by one walk the first time it is needed
+    epub_index = None
+    external_index = None
     missing_count = 0
+    # Checked in memory instead of one stat per reference; kept up to date on copy
+    existing = media_file_names(epub_root)
 
-    for ref in sorted(references):
-        if is_skip_file(ref):
-            continue
-        if not is_media_file(ref):
-            continue
+    # Filter first and sort only what is missing, usually a handful of names.
+    # Everything below depends on the file name alone, so references to the
+    # same file from different folders are handled once
+    missing = {
+        media_file_name(ref) for ref in references
+        if not is_skip_file(ref) and is_media_file(ref)
+    } - existing
 
-        dest_abs, fname = unify_to_epub_media(epub_root, ref)
-        if os.path.isfile(dest_abs):
-            continue  # we already have it
+    for fname in sorted(missing):
+        dest_abs = os.path.join(epub_root, 'EPUB', MEDIA_DIR_NAME, fname)
 
         # Not present
         missing_count += 1
         print(f"\n[INFO] Missing resource: {fname}")
-        found_in_epub = find_file_recursively(epub_root, fname)
+        if epub_index is None:
+            epub_index = build_name_index(epub_root)
+        found_in_epub = epub_index.get(fname)
         if found_in_epub:
             os.makedirs(os.path.dirname(dest_abs), exist_ok=True)
-            shutil.copy2(found_in_epub, dest_abs)
+            link_or_copy(found_in_epub, dest_abs)
+            existing.add(fname)
             print(f"[INFO] Found in epub: {found_in_epub} => {dest_abs}")
             continue
 
@@ -272,10 +427,13 @@ def fix_missing_media(epub_root, references, original_epub_dir):
                 search_folder = None
 
         if search_folder and os.path.isdir(search_folder):
-            found_external = find_file_recursively(search_folder, fname)
+            if external_index is None:
+                external_index = build_name_index(search_folder)
+            found_external = external_index.get(fname)
             if found_external:
                 os.makedirs(os.path.dirname(dest_abs), exist_ok=True)
-                shutil.copy2(found_external, dest_abs)
+                link_or_copy(found_external, dest_abs)
+                existing.add(fname)
                 print(f"[INFO] Copied from {found_external} => {dest_abs}")
             else:
                 print(f"[WARN] Could not find {fname} in {search_folder}, skipping.")
@@ -304,65 +462,103 @@ def compute_relative_path(xhtml_file_abs, media_file_abs):
     rel_path = rel_path.replace('\\','/')
     return rel_path
 
-def rewrite_xhtml_references(epub_root):
+def rewrite_document(xhtml_abs, tree, epub_root, media_names):
     """
-    - For each .xhtml or .html:
-      1) parse
-      2) for each src/href with a "media" extension, unify physically to [epub_root]/EPUB/media/<filename>
-      3) compute relative path from .xhtml's folder to the media file, e.g. "../media/file.png"
-      4) fix angle brackets
-      5) write back if changed
+    - For one parsed .xhtml or .html tree (media_names: files present in EPUB/media):
+      1) for each src/href with a "media" extension, unify physically to [epub_root]/EPUB/media/<filename>
+      2) compute relative path from .xhtml's folder to the media file, e.g. "../media/file.png"
+      3) fix angle brackets
+      4) write back if changed
     """
-    print("[INFO] Rewriting references in XHTML so they're relative to 'EPUB/media/<filename>'...")
+    changed = False
+    try:
+        xroot = tree.getroot()
 
-    parser = XMLParser(ns_clean=True, recover=True, encoding='utf-8')
-    for root, dirs, files in os.walk(epub_root):
-        for f in files:
-            if not f.lower().endswith(('.xhtml','.html','.htm')):
+        # find all src/href
+        for el, attr, val in iter_resource_attributes(xroot):
+            # skip if it's .xhtml
+            if is_skip_file(val):
+                continue
+            # skip if not a media extension
+            if not is_media_file(val):
                 continue
 
-            xhtml_abs = os.path.join(root, f)
-            changed = False
-            try:
-                tree = etree.parse(xhtml_abs, parser=parser)
-                xroot = tree.getroot()
-                if xroot is None:
-                    continue
-
-                # find all src/href
-                elems = xroot.xpath('//*[@src or @href or @xlink:href]',
-                                    namespaces={'xlink':'http://www.w3.org/1999/xlink'})
-                for el in elems:
-                    for attr in ['src','href','{http://www.w3.org/1999/xlink}href']:
-                        val = el.get(attr)
-                        if not val or val.lower().startswith(('http:','https:')):
-                            continue
-                        # skip if it's .xhtml
-                        if is_skip_file(val):
-                            continue
-                        # skip if not a media extension
-                        if not is_media_file(val):
-                            continue
-
-                        # we unify physically to [epub_root]/EPUB/media/<filename>
-                        # then compute relative from xhtml file
-                        media_abs, fname = unify_to_epub_media(epub_root, val)
-                        if os.path.isfile(media_abs):
-                            # compute relative path
-                            rel_path = compute_relative_path(xhtml_abs, media_abs)
-                            if rel_path != val:
-                                el.set(attr, rel_path)
-                                changed = True
-
-                # fix angle brackets
-                if fix_angle_brackets_in_element(xroot):
+            # we unify physically to [epub_root]/EPUB/media/<filename>
+            # then compute relative from xhtml file
+            media_abs, fname = unify_to_epub_media(epub_root, val)
+            if fname in media_names:
+                # compute relative path
+                rel_path = compute_relative_path(xhtml_abs, media_abs)
+                if rel_path != val:
+                    el.set(attr, rel_path)
                     changed = True
 
-                if changed:
-                    tree.write(xhtml_abs, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        # fix angle brackets
+        if fix_angle_brackets_in_element(xroot):
+            changed = True
+
+        if changed:
+            # Large buffer: one big file becomes a few write calls
+            with open(xhtml_abs, 'wb', buffering=1 << 20) as fh:
+                tree.write(fh, encoding='utf-8', xml_declaration=True)
+
+    except Exception as ex:
+        print(f"[WARN] Could not rewrite {xhtml_abs}: {ex}")
+
+def rewrite_file(xhtml_abs, epub_root, media_names):
+    """Parse and rewrite one file; the unit of work for the worker processes."""
+    try:
+        tree = etree.parse(xhtml_abs, parser=XML_PARSER)
+    except Exception as ex:
+        print(f"[WARN] Could not rewrite {xhtml_abs}: {ex}")
+        return
+    # Nothing to rewrite; the serial path drops such files while loading
+    if tree.getroot() is None:
+        return
+    rewrite_document(xhtml_abs, tree, epub_root, media_names)
+
+def rewrite_xhtml_references(epub_root, documents, workers=None):
+    """
+    Rewrite every (path, tree) in documents with rewrite_document.
+
+    Files are independent, so unless workers is 1 they are rewritten in a
+    process pool. lxml trees can't be sent to another process, so each worker
+    parses its file again; the serial path reuses the trees already parsed.
+    """
+    print("[INFO] Rewriting references in XHTML so they're relative to 'EPUB/media/<filename>'...")
 
-            except Exception as ex:
-                print(f"[WARN] Could not rewrite {xhtml_abs}: {ex}")
+    # Media is only added before this step, so one directory read answers every lookup
+    media_names = media_file_names(epub_root)
+
+    if workers == 1 or len(documents) < 2:
+        for xhtml_abs, tree in documents:
+            if tree is None:
+                rewrite_file(xhtml_abs, epub_root, media_names)
+            else:
+                rewrite_document(xhtml_abs, tree, epub_root, media_names)
+        return
+
+    paths = [xhtml_abs for xhtml_abs, _ in documents]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(partial(rewrite_file, epub_root=epub_root, media_names=media_names),
+                          paths, chunksize=8))
+
+def process_epub(epub_root, original_epub_dir, workers=None):
+    """
+    Fix an unzipped EPUB in place. The tree is walked once. Run serially, every
+    XHTML file is parsed once and that tree feeds both the reference gathering
+    and the rewrite; with a worker pool the rewrite parses in the workers, so
+    gathering only streams each file instead of keeping its tree.
+    """
+    print("[INFO] Gathering references from OPF + XHTML...")
+    opf_file, documents, xhtml_refs = load_epub_documents(epub_root, keep_trees=workers == 1)
+    refs = gather_all_references(opf_file, xhtml_refs)
+
+    print("[INFO] Copying missing media into [EPUB/media]...")
+    fix_missing_media(epub_root, refs, original_epub_dir)
+
+    print("[INFO] Rewriting .xhtml references => relative to [EPUB/media]...")
+    rewrite_xhtml_references(epub_root, documents, workers)
 
 ################################################################################
 # MAIN
@@ -371,7 +567,7 @@ def rewrite_xhtml_references(epub_root):
 def main():
     try:
         if len(sys.argv) < 2:
-            print("Usage: python validate_and_fix_epub.py <your.epub>")
+            print("Usage: python validate_and_fix_epub.py <your.epub> [workers]")
             sys.exit(0)
 
         epub_path = os.path.abspath(sys.argv[1])
@@ -380,19 +576,14 @@ def main():
             sys.exit(1)
 
         original_dir = os.path.dirname(epub_path)
+        # Optional worker process count for the XHTML rewrite (1 = no pool)
+        workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
 
         with tempfile.TemporaryDirectory() as tmpdir:
             print("[INFO] Extracting EPUB to temp folder...")
             extract_epub(epub_path, tmpdir)
 
-            print("[INFO] Gathering references from OPF + XHTML...")
-            refs = gather_all_references(tmpdir)
-
-            print("[INFO] Copying missing media into [EPUB/media]...")
-            fix_missing_media(tmpdir, refs, original_dir)
-
-            print("[INFO] Rewriting .xhtml references => relative to [EPUB/media]...")
-            rewrite_xhtml_references(tmpdir)
+            process_epub(tmpdir, original_dir, workers)
 
             print("[INFO] Repacking EPUB...")
             repack_epub(tmpdir, epub_path)
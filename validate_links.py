@@ -8,12 +8,13 @@ import os
 import re
 import random
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from urllib.parse import urlparse
 import sys
 import signal
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Tuple, Dict
+from typing import Dict, Iterable, Iterator, List, Tuple
 import time
 
 # ANSI color codes
@@ -26,44 +27,98 @@ CYAN = '\033[96m'
 BOLD = '\033[1m'
 RESET = '\033[0m'
 
-def extract_links_from_md(md_file: Path) -> List[str]:
-    """Extract all HTTP/HTTPS links from a markdown file."""
+# Markdown links [text](url) and direct URLs not in markdown link format, found
+# in one scan; the link text is searched for direct URLs on its own
+_DIRECT_LINK_PATTERN = r'(?<!\()https?://[^\s\)<>]+'
+_LINK_RE = re.compile(
+    r'\[(?P<text>[^\]]+)\]\((?P<md>https?://[^)]+)\)'
+    rf'|(?P<bare>{_DIRECT_LINK_PATTERN})'
+)
+_DIRECT_LINK_RE = re.compile(_DIRECT_LINK_PATTERN)
+
+# URL substrings of links known to be broken, skipped with --exclude-known-broken
+KNOWN_BROKEN_PATTERNS = (
+    '/Shared_Admin/',  # Shared content not published online
+    '/ENCODINGS/',     # Encoding reference pages
+    'localhost',       # Example URLs
+    '127.0.0.1',
+    'example.com',
+    'host:port',
+)
+# One search finds any of the patterns, instead of one substring test each
+_KNOWN_BROKEN_RE = re.compile('|'.join(map(re.escape, KNOWN_BROKEN_PATTERNS)))
+
+def iter_links_from_md(md_file: Path) -> Iterator[str]:
+    """Yield each distinct HTTP/HTTPS link of a markdown file, in first-seen order."""
     try:
         with open(md_file, 'r', encoding='utf-8') as f:
             content = f.read()
-        
-        # Pattern to match markdown links [text](url) and direct URLs
-        pattern = r'\[([^\]]+)\]\((https?://[^)]+)\)'
-        matches = re.findall(pattern, content)
-        
-        # Extract just the URLs
-        links = [url for _, url in matches]
-        
-        # Also find direct URLs not in markdown link format
-        direct_pattern = r'(?<!\()(https?://[^\s\)<>]+)'
-        direct_links = re.findall(direct_pattern, content)
-        
-        all_links = list(set(links + direct_links))  # Remove duplicates
-        return all_links
-    
     except Exception as e:
         print(f"{RED}Error reading {md_file}: {e}{RESET}")
-        return []
+        return
+    
+    seen = set()
+    for m in _LINK_RE.finditer(content):
+        if m.group('md'):
+            urls = _DIRECT_LINK_RE.findall(m.group('text'))
+            urls.append(m.group('md'))
+        else:
+            urls = (m.group('bare'),)
+        for url in urls:
+            if url not in seen:
+                seen.add(url)
+                yield url
 
-def check_url(url: str, timeout: int = 10, delay: float = 0.0) -> Tuple[str, int, str]:
+def extract_links_from_md(md_file: Path) -> List[str]:
+    """Extract all HTTP/HTTPS links from a markdown file."""
+    return list(iter_links_from_md(md_file))
+
+def reservoir_sample(iterable: Iterable, k: int) -> Tuple[int, list]:
+    """
+    Pick k items uniformly at random from iterable in one pass (Algorithm R),
+    holding only the k picks in memory.
+    Returns (number of items seen, picks).
+    """
+    sample = []
+    n = 0
+    for n, item in enumerate(iterable, 1):
+        if n <= k:
+            sample.append(item)
+        else:
+            j = random.randrange(n)
+            if j < k:
+                sample[j] = item
+    return n, sample
+
+def make_session(pool_size: int = 10) -> requests.Session:
+    """
+    Create a Session whose connection pools hold pool_size connections per
+    host, so concurrent checks reuse keep-alive TCP/TLS connections.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def check_url(url: str, timeout: int = 10, delay: float = 0.0, session: requests.Session = None) -> Tuple[str, int, str]:
     """
     Check if a URL returns 200 OK.
     Returns (url, status_code, error_message)
     """
+    # The module-level requests functions open a new connection every call
+    http = session or requests
     try:
         if delay and delay > 0:
             time.sleep(delay)
-        response = requests.head(url, timeout=timeout, allow_redirects=True)
+        response = http.head(url, timeout=timeout, allow_redirects=True)
         # If HEAD doesn't work, try GET
         if response.status_code == 405 or response.status_code == 404:
             if delay and delay > 0:
                 time.sleep(delay)
-            response = requests.get(url, timeout=timeout, allow_redirects=True)
+            # Only the status is needed: stream, so the body is never downloaded
+            with http.get(url, timeout=timeout, allow_redirects=True, stream=True) as response:
+                pass
         return (url, response.status_code, "")
     except requests.exceptions.Timeout:
         return (url, 0, "Timeout")
@@ -76,68 +131,62 @@ def check_url(url: str, timeout: int = 10, delay: float = 0.0) -> Tuple[str, int
     except Exception as e:
         return (url, 0, f"Unknown Error: {str(e)}")
 
-def validate_file_links(md_file: Path, num_links: int = 5, max_workers: int = 5, url_filter: str = None, exclude_known_broken: bool = False, check_all: bool = False, request_delay: float = 0.0) -> Dict:
+def select_file_links(md_file: Path, num_links: int = 5, url_filter: str = None, exclude_known_broken: bool = False, check_all: bool = False) -> Tuple[int, List[str]]:
     """
-    Validate random links from a markdown file.
-    Returns a dictionary with validation results.
+    Pick the links of a markdown file that should be checked.
+    Returns (number of links after filtering, links to check).
     """
-    links = extract_links_from_md(md_file)
+    links = iter_links_from_md(md_file)
     
     # Apply URL filter if provided
     if url_filter:
-        links = [url for url in links if url_filter in url]
+        links = (url for url in links if url_filter in url)
     
     # Exclude known broken patterns if requested
     if exclude_known_broken:
-        known_broken_patterns = [
-            '/Shared_Admin/',  # Shared content not published online
-            '/ENCODINGS/',     # Encoding reference pages
-            'localhost',       # Example URLs
-            '127.0.0.1',
-            'example.com',
-            'host:port',
-        ]
-        links = [url for url in links if not any(pattern in url for pattern in known_broken_patterns)]
-    
-    if not links:
-        return {
-            'file': md_file,
-            'total_links': 0,
-            'checked_links': 0,
-            'results': [],
-            'has_errors': False
-        }
+        links = (url for url in links if not _KNOWN_BROKEN_RE.search(url))
     
     # Pick links to check
     if check_all:
-        sampled_links = links
-    else:
-        sample_size = min(num_links, len(links))
-        sampled_links = random.sample(links, sample_size)
-    
-    results = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {executor.submit(check_url, url, 10, request_delay): url for url in sampled_links}
-        
-        for future in as_completed(future_to_url):
-            url, status_code, error = future.result()
-            results.append({
-                'url': url,
-                'status_code': status_code,
-                'error': error,
-                'success': status_code == 200
-            })
-    
-    has_errors = any(not r['success'] for r in results)
+        links = list(links)
+        return len(links), links
+    return reservoir_sample(links, num_links)
+
+def build_file_result(md_file: Path, total_links: int, checks: List[Tuple[str, int, str]]) -> Dict:
+    """Turn the check_url() results of one file into its result dictionary."""
+    results = [
+        {
+            'url': url,
+            'status_code': status_code,
+            'error': error,
+            'success': status_code == 200
+        }
+        for url, status_code, error in checks
+    ]
     
     return {
         'file': md_file,
-        'total_links': len(links),
+        'total_links': total_links,
         'checked_links': len(results),
         'results': results,
-        'has_errors': has_errors
+        'has_errors': any(not r['success'] for r in results)
     }
 
+def validate_file_links(md_file: Path, num_links: int = 5, max_workers: int = 5, url_filter: str = None, exclude_known_broken: bool = False, check_all: bool = False, request_delay: float = 0.0) -> Dict:
+    """
+    Validate random links from a markdown file.
+    Returns a dictionary with validation results.
+    """
+    total_links, sampled_links = select_file_links(md_file, num_links, url_filter, exclude_known_broken, check_all)
+    if not sampled_links:
+        return build_file_result(md_file, total_links, [])
+    
+    with make_session(max_workers) as session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(check_url, url, 10, request_delay, session) for url in sampled_links]
+        checks = [future.result() for future in as_completed(futures)]
+    
+    return build_file_result(md_file, total_links, checks)
+
 def print_file_results(file_result: Dict, log_errors_path: Path = None):
     """Print results for a single file."""
     file_path = file_result['file']
@@ -254,21 +303,45 @@ Examples:
     # Process each file
     all_results = []
     files_with_errors = []
+    # Each distinct URL is requested once, however many files link to it
+    url_futures = {}
     
     try:
-        for md_file in md_files:
-            print(f"\n{BLUE}Processing: {md_file.name}...{RESET}", end='', flush=True)
-            result = validate_file_links(md_file, args.num_links, args.max_workers, args.url_filter, args.exclude_known_broken, args.check_all, args.request_delay)
-            all_results.append(result)
-            
-            if result['has_errors']:
-                files_with_errors.append(md_file)
-            
-            # Clear the "Processing..." line
-            print(f"\r{' ' * 100}\r", end='', flush=True)
+        # One pool serves every file: all checks are queued up front, so the
+        # workers never sit idle waiting for the slowest link of a file, and
+        # results are still reported file by file in order
+        # The workers share one Session, reusing connections to the same host
+        session = make_session(args.max_workers)
+        executor = ThreadPoolExecutor(max_workers=args.max_workers)
+        try:
+            pending = []
+            for md_file in md_files:
+                total_links, sampled_links = select_file_links(md_file, args.num_links, args.url_filter, args.exclude_known_broken, args.check_all)
+                futures = []
+                for url in sampled_links:
+                    future = url_futures.get(url)
+                    if future is None:
+                        future = url_futures[url] = executor.submit(check_url, url, 10, args.request_delay, session)
+                    futures.append(future)
+                pending.append((md_file, total_links, futures))
             
-            # Print results
-            print_file_results(result, log_errors_path)
+            for md_file, total_links, futures in pending:
+                print(f"\n{BLUE}Processing: {md_file.name}...{RESET}", end='', flush=True)
+                result = build_file_result(md_file, total_links, [future.result() for future in futures])
+                all_results.append(result)
+                
+                if result['has_errors']:
+                    files_with_errors.append(md_file)
+                
+                # Clear the "Processing..." line
+                print(f"\r{' ' * 100}\r", end='', flush=True)
+                
+                # Print results
+                print_file_results(result, log_errors_path)
+        finally:
+            # On Ctrl-C, drop the checks still queued instead of running them all
+            executor.shutdown(cancel_futures=True)
+            session.close()
     except KeyboardInterrupt:
         print(f"\n\n{YELLOW}⚠ Interrupted by user during processing{RESET}")
         print(f"{CYAN}Partial results processed: {len(all_results)}/{len(md_files)} files{RESET}")
@@ -289,6 +362,7 @@ Examples:
     
     print(f"  Total links found: {total_links_found}")
     print(f"  Total links checked: {total_links_checked}")
+    print(f"  Unique URLs requested: {len(url_futures)}")
     print(f"  Total errors: {total_errors}")
     print(f"  Time elapsed: {elapsed_time:.2f}s")
     
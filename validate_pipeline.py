@@ -18,12 +18,15 @@ def main():
     print("PIPELINE VALIDATION TEST")
     print("=" * 70)
     
+    # Fetch both index pages used below in one concurrent pass
+    items, main_items = _pipeline.scan_documentation_sites([
+        "https://www.microfocus.com/documentation/idol/knowledge-discovery-25.4/",
+        "https://www.microfocus.com/documentation/idol/",
+    ])
+    
     # Test 1: Default URL (Knowledge Discovery 25.4)
     print("\nTest 1: Scanning default URL (Knowledge Discovery 25.4)")
     print("-" * 70)
-    items = _pipeline.scan_documentation_site(
-        "https://www.microfocus.com/documentation/idol/knowledge-discovery-25.4/"
-    )
     print(f"✓ Found {len(items)} documentation items")
     
     if items:
@@ -67,9 +70,6 @@ def main():
     # Test 5: Main IDOL index (should return 0 items)
     print("\nTest 5: Scanning main IDOL index (should find 0 ZIPs)")
     print("-" * 70)
-    main_items = _pipeline.scan_documentation_site(
-        "https://www.microfocus.com/documentation/idol/"
-    )
     if len(main_items) == 0:
         print("✓ Correctly returns 0 items (main index has no ZIPs)")
     else: